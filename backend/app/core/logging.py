@@ -68,6 +68,17 @@ def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     return structlog.get_logger(name)
 
 
+def is_debug_enabled(name: str) -> bool:
+    """
+    Check whether DEBUG records for a logger would be emitted.
+    
+    Use to skip building expensive debug fields on hot paths.
+    Checks the underlying stdlib logger, so it works before
+    setup_logging() has configured structlog.
+    """
+    return logging.getLogger(name).isEnabledFor(logging.DEBUG)
+
+
 def _truncate_content(content: str, max_length: int = 0) -> str:
     """Truncate content if max_length is set."""
     if max_length <= 0:
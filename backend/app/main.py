@@ -1,13 +1,16 @@
 """
 MyCoach Backend - FastAPI Application
 """
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
 from app.core.database import init_db
+from app.services.context.embedding import close_http_client
+from app.services.memory.manager import get_working_memory
 from app.api import plans, records
 
 logger = get_logger(__name__)
@@ -21,11 +24,16 @@ async def lifespan(app: FastAPI):
     logger.info("Starting MyCoach Backend", version="1.0.0")
     await init_db()
     logger.info("Database initialized")
+    cleanup_task = asyncio.create_task(get_working_memory().run_cleanup())
     
     yield
     
     # Shutdown
     logger.info("Shutting down MyCoach Backend")
+    cleanup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await cleanup_task
+    await close_http_client()
 
 
 app = FastAPI(
@@ -10,6 +10,7 @@ This module provides:
 from app.services.analytics.adapter import (
     NormalizedActivity,
     IntervalData,
+    IntervalArrays,
     RawDataAdapter,
     IntervalsAdapter,
     StravaAdapter,
@@ -23,6 +24,7 @@ __all__ = [
     # Data structures
     "NormalizedActivity",
     "IntervalData",
+    "IntervalArrays",
     # Adapters
     "RawDataAdapter",
     "IntervalsAdapter",
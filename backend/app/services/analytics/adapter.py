@@ -8,14 +8,42 @@ Supported sources:
 - FIT/TCX files (future)
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from itertools import compress
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
 
-from app.core.logging import get_logger
+from app.core.logging import get_logger, is_debug_enabled
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _quality_score(
+    has_hr: bool,
+    has_power: bool,
+    has_intervals: bool,
+    has_rpe: bool
+) -> float:
+    """
+    Data quality score for a combination of available data.
+    
+    Only 16 input combinations exist, so results are memoized.
+    """
+    score = 0.3  # Base score for having duration
+    
+    if has_hr:
+        score += 0.2
+    if has_power:
+        score += 0.2
+    if has_intervals:
+        score += 0.2
+    if has_rpe:
+        score += 0.1
+    
+    return min(score, 1.0)
+
+
 @dataclass
 class IntervalData:
     """Single interval/segment data."""
@@ -31,6 +59,129 @@ class IntervalData:
     notes: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class IntervalArrays:
+    """
+    Column-oriented view of a list of intervals (struct of arrays).
+    
+    Each field holds one value per interval, in interval order.
+    Missing measurements are kept as None so positions stay aligned.
+    Strategies that only need one or two fields (e.g. power drop on
+    the last work interval) can scan those columns directly instead
+    of touching every IntervalData object.
+    """
+    index: Tuple[int, ...] = ()
+    interval_type: Tuple[str, ...] = ()
+    durations: Tuple[int, ...] = ()
+    avg_power: Tuple[Optional[float], ...] = ()
+    avg_hr: Tuple[Optional[float], ...] = ()
+    max_hr: Tuple[Optional[float], ...] = ()
+    avg_pace: Tuple[Optional[float], ...] = ()
+    target_power: Tuple[Optional[str], ...] = ()
+    rpe: Tuple[Optional[float], ...] = ()
+    notes: Tuple[Optional[str], ...] = ()
+    
+    # Memoized where_present()/where_type() results
+    _subsets: Dict[Hashable, "IntervalArrays"] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    @classmethod
+    def from_intervals(cls, intervals: List[IntervalData]) -> "IntervalArrays":
+        """Transpose a list of intervals into columns."""
+        if not intervals:
+            return cls()
+        
+        rows = (
+            (
+                i.index,
+                i.interval_type,
+                i.duration_seconds,
+                i.avg_power,
+                i.avg_hr,
+                i.max_hr,
+                i.avg_pace,
+                i.target_power,
+                i.rpe,
+                i.notes,
+            )
+            for i in intervals
+        )
+        return cls(*zip(*rows))
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def where_present(self, column: str) -> "IntervalArrays":
+        """
+        Get the rows that have a value in the given column.
+        
+        Filtering is done once per column and shared, so e.g. the HR
+        drift (level 1), HR zone (level 2) and drift start (level 3)
+        calculations all reuse a single pass over the HR column.
+        
+        Args:
+            column: Column name, e.g. "avg_hr" or "avg_power"
+            
+        Returns:
+            IntervalArrays restricted to rows where column is not None
+        """
+        subset = self._subsets.get(column)
+        
+        if subset is None:
+            subset = self._select([value is not None for value in getattr(self, column)])
+            self._subsets[column] = subset
+        
+        return subset
+    
+    def where_type(self, interval_types: FrozenSet[str]) -> "IntervalArrays":
+        """
+        Get the rows whose interval_type is one of interval_types.
+        
+        Membership is tested once per type set and memoized, so strategies
+        can keep their work-type sets as module constants and chain with
+        where_present() without re-scanning the type column.
+        
+        Args:
+            interval_types: Interval types to keep, e.g. {"work", "threshold"}
+            
+        Returns:
+            IntervalArrays restricted to matching rows
+        """
+        subset = self._subsets.get(interval_types)
+        
+        if subset is None:
+            subset = self._select([t in interval_types for t in self.interval_type])
+            self._subsets[interval_types] = subset
+        
+        return subset
+    
+    def _select(self, mask: List[bool]) -> "IntervalArrays":
+        """Build the subset of rows where mask is True."""
+        if all(mask):
+            return self
+        return IntervalArrays(*(
+            tuple(compress(getattr(self, f.name), mask))
+            for f in fields(self)
+            if f.init
+        ))
+    
+    def __getitem__(self, position: int) -> IntervalData:
+        """Rebuild a single IntervalData row for legacy callers."""
+        return IntervalData(
+            index=self.index[position],
+            interval_type=self.interval_type[position],
+            duration_seconds=self.durations[position],
+            avg_power=self.avg_power[position],
+            avg_hr=self.avg_hr[position],
+            max_hr=self.max_hr[position],
+            avg_pace=self.avg_pace[position],
+            target_power=self.target_power[position],
+            rpe=self.rpe[position],
+            notes=self.notes[position],
+        )
+
+
 @dataclass
 class NormalizedActivity:
     """
@@ -58,6 +209,11 @@ class NormalizedActivity:
     # Raw data backup for debugging
     raw_data: Dict[str, Any] = field(default_factory=dict)
     
+    # Memoized column view of intervals (see get_interval_arrays)
+    _interval_arrays: Optional[IntervalArrays] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
     def has_power_data(self) -> bool:
         """Check if power data is available."""
         return bool(self.summary.get("avg_power"))
@@ -70,24 +226,34 @@ class NormalizedActivity:
         """Check if interval data is available."""
         return len(self.intervals) > 0
     
+    def get_interval_arrays(self) -> IntervalArrays:
+        """
+        Get interval data in column-oriented form.
+        
+        Built on first access and shared by all strategy levels, so the
+        interval objects are scanned once per activity. Intervals are
+        treated as immutable once the adapter has normalized them; code
+        that edits them must work on a new NormalizedActivity.
+        """
+        arrays = self._interval_arrays
+        if arrays is None:
+            arrays = IntervalArrays.from_intervals(self.intervals)
+            self._interval_arrays = arrays
+        return arrays
+    
     def get_data_quality_score(self) -> float:
         """
         Calculate data quality score (0-1).
         
         Higher score means more complete and reliable data.
         """
-        score = 0.3  # Base score for having duration
-        
-        if self.has_hr_data():
-            score += 0.2
-        if self.has_power_data():
-            score += 0.2
-        if self.has_intervals():
-            score += 0.2
-        if self.summary.get("rpe"):
-            score += 0.1
-        
-        return min(score, 1.0)
+        summary = self.summary
+        return _quality_score(
+            bool(summary.get("avg_hr")),
+            bool(summary.get("avg_power")),
+            bool(self.intervals),
+            bool(summary.get("rpe")),
+        )
 
 
 class RawDataAdapter(ABC):
@@ -95,6 +261,20 @@ class RawDataAdapter(ABC):
     
     source_name: str = "unknown"
     
+    # Field holding the activity type in this source's payloads
+    type_field: str = "type"
+    
+    # Other field names tried when type_field is absent
+    FALLBACK_TYPE_FIELDS = ("activityType", "activity_type", "sport")
+    
+    # Unified type -> substrings identifying it in source-specific names
+    TYPE_KEYWORDS = (
+        ("cycling", ("ride", "cycling", "bike", "virtualride", "indoor_cycling")),
+        ("running", ("run", "running", "virtualrun", "treadmill")),
+        ("strength", ("strength", "weighttraining", "weight_training", "gym")),
+        ("swimming", ("swim", "swimming", "pool_swim", "open_water_swim")),
+    )
+    
     @abstractmethod
     def normalize(self, raw_data: Dict[str, Any]) -> NormalizedActivity:
         """
@@ -108,34 +288,33 @@ class RawDataAdapter(ABC):
         """
         pass
     
+    @staticmethod
+    def _copy_fields(
+        raw_data: Dict[str, Any],
+        field_map: Tuple[Tuple[str, str], ...]
+    ) -> Dict[str, Any]:
+        """Copy present raw fields to summary keys per a (raw, summary) table."""
+        return {key: raw_data[raw_key] for raw_key, key in field_map if raw_key in raw_data}
+    
     def _detect_activity_type(self, raw_data: Dict[str, Any]) -> str:
         """Detect activity type from raw data."""
-        # Common field names for activity type
-        type_fields = ["type", "activityType", "activity_type", "sport"]
+        if self.type_field in raw_data:
+            return self._map_activity_type(str(raw_data[self.type_field]))
         
-        for field_name in type_fields:
+        # Slow path for payloads using a non-standard field name
+        for field_name in self.FALLBACK_TYPE_FIELDS:
             if field_name in raw_data:
-                return self._map_activity_type(str(raw_data[field_name]).lower())
+                return self._map_activity_type(str(raw_data[field_name]))
         
         return "other"
     
     def _map_activity_type(self, raw_type: str) -> str:
         """Map source-specific type to unified type."""
-        cycling_types = ["ride", "cycling", "bike", "virtualride", "indoor_cycling"]
-        running_types = ["run", "running", "virtualrun", "treadmill"]
-        strength_types = ["strength", "weighttraining", "weight_training", "gym"]
-        swimming_types = ["swim", "swimming", "pool_swim", "open_water_swim"]
-        
         raw_lower = raw_type.lower()
         
-        if any(t in raw_lower for t in cycling_types):
-            return "cycling"
-        if any(t in raw_lower for t in running_types):
-            return "running"
-        if any(t in raw_lower for t in strength_types):
-            return "strength"
-        if any(t in raw_lower for t in swimming_types):
-            return "swimming"
+        for activity_type, keywords in self.TYPE_KEYWORDS:
+            if any(t in raw_lower for t in keywords):
+                return activity_type
         
         return "other"
 
@@ -152,6 +331,21 @@ class IntervalsAdapter(RawDataAdapter):
     
     source_name = "intervals"
     
+    # Raw field -> summary key, copied as-is
+    SUMMARY_FIELDS = (
+        # Heart rate
+        ("average_heartrate", "avg_hr"),
+        ("max_heartrate", "max_hr"),
+        # Power (cycling)
+        ("average_watts", "avg_power"),
+        ("max_watts", "max_power"),
+        ("weighted_average_watts", "normalized_power"),
+        # Elevation
+        ("total_elevation_gain", "elevation_m"),
+        # RPE if available
+        ("perceived_exertion", "rpe"),
+    )
+    
     def normalize(self, raw_data: Dict[str, Any]) -> NormalizedActivity:
         """Normalize Intervals.icu activity data."""
         
@@ -178,13 +372,14 @@ class IntervalsAdapter(RawDataAdapter):
             raw_data=raw_data,
         )
         
-        logger.debug(
-            "Normalized Intervals.icu activity",
-            activity_type=activity_type,
-            duration=duration,
-            intervals_count=len(intervals),
-            quality=activity.get_data_quality_score()
-        )
+        if is_debug_enabled(__name__):
+            logger.debug(
+                "Normalized Intervals.icu activity",
+                activity_type=activity_type,
+                duration=duration,
+                intervals_count=len(intervals),
+                quality=activity.get_data_quality_score()
+            )
         
         return activity
     
@@ -201,21 +396,7 @@ class IntervalsAdapter(RawDataAdapter):
     
     def _build_summary(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """Build summary metrics dict."""
-        summary = {}
-        
-        # Heart rate
-        if "average_heartrate" in raw_data:
-            summary["avg_hr"] = raw_data["average_heartrate"]
-        if "max_heartrate" in raw_data:
-            summary["max_hr"] = raw_data["max_heartrate"]
-        
-        # Power (cycling)
-        if "average_watts" in raw_data:
-            summary["avg_power"] = raw_data["average_watts"]
-        if "max_watts" in raw_data:
-            summary["max_power"] = raw_data["max_watts"]
-        if "weighted_average_watts" in raw_data:
-            summary["normalized_power"] = raw_data["weighted_average_watts"]
+        summary = self._copy_fields(raw_data, self.SUMMARY_FIELDS)
         
         # TSS and related
         if "suffer_score" in raw_data:
@@ -227,25 +408,15 @@ class IntervalsAdapter(RawDataAdapter):
         if "distance" in raw_data:
             summary["distance_km"] = raw_data["distance"] / 1000
         
-        # Elevation
-        if "total_elevation_gain" in raw_data:
-            summary["elevation_m"] = raw_data["total_elevation_gain"]
-        
-        # RPE if available
-        if "perceived_exertion" in raw_data:
-            summary["rpe"] = raw_data["perceived_exertion"]
-        
         return summary
     
     def _extract_intervals(self, raw_data: Dict[str, Any]) -> List[IntervalData]:
         """Extract interval data."""
-        intervals = []
-        
         # Intervals.icu stores intervals in 'icu_intervals' or 'intervals'
         raw_intervals = raw_data.get("icu_intervals") or raw_data.get("intervals") or []
         
-        for idx, interval in enumerate(raw_intervals):
-            interval_data = IntervalData(
+        return [
+            IntervalData(
                 index=idx,
                 interval_type=interval.get("type", "work"),
                 duration_seconds=interval.get("elapsed_time", 0),
@@ -255,9 +426,8 @@ class IntervalsAdapter(RawDataAdapter):
                 target_power=interval.get("target"),
                 notes=interval.get("label"),
             )
-            intervals.append(interval_data)
-        
-        return intervals
+            for idx, interval in enumerate(raw_intervals)
+        ]
 
 
 class StravaAdapter(RawDataAdapter):
@@ -272,6 +442,16 @@ class StravaAdapter(RawDataAdapter):
     
     source_name = "strava"
     
+    # Raw field -> summary key, copied as-is
+    SUMMARY_FIELDS = (
+        ("average_heartrate", "avg_hr"),
+        ("max_heartrate", "max_hr"),
+        ("average_watts", "avg_power"),
+        ("weighted_average_watts", "normalized_power"),
+        ("total_elevation_gain", "elevation_m"),
+        ("suffer_score", "tss"),
+    )
+    
     def normalize(self, raw_data: Dict[str, Any]) -> NormalizedActivity:
         """Normalize Strava activity data."""
         
@@ -292,44 +472,31 @@ class StravaAdapter(RawDataAdapter):
             raw_data=raw_data,
         )
         
-        logger.debug(
-            "Normalized Strava activity",
-            activity_type=activity_type,
-            duration=duration,
-            quality=activity.get_data_quality_score()
-        )
+        if is_debug_enabled(__name__):
+            logger.debug(
+                "Normalized Strava activity",
+                activity_type=activity_type,
+                duration=duration,
+                quality=activity.get_data_quality_score()
+            )
         
         return activity
     
     def _build_summary(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """Build summary from Strava data."""
-        summary = {}
-        
-        if "average_heartrate" in raw_data:
-            summary["avg_hr"] = raw_data["average_heartrate"]
-        if "max_heartrate" in raw_data:
-            summary["max_hr"] = raw_data["max_heartrate"]
-        if "average_watts" in raw_data:
-            summary["avg_power"] = raw_data["average_watts"]
-        if "weighted_average_watts" in raw_data:
-            summary["normalized_power"] = raw_data["weighted_average_watts"]
+        summary = self._copy_fields(raw_data, self.SUMMARY_FIELDS)
+        
         if "distance" in raw_data:
             summary["distance_km"] = raw_data["distance"] / 1000
-        if "total_elevation_gain" in raw_data:
-            summary["elevation_m"] = raw_data["total_elevation_gain"]
-        if "suffer_score" in raw_data:
-            summary["tss"] = raw_data["suffer_score"]
         
         return summary
     
     def _extract_intervals(self, raw_data: Dict[str, Any]) -> List[IntervalData]:
         """Extract intervals from Strava laps."""
-        intervals = []
-        
         laps = raw_data.get("laps") or []
         
-        for idx, lap in enumerate(laps):
-            interval_data = IntervalData(
+        return [
+            IntervalData(
                 index=idx,
                 interval_type="work",
                 duration_seconds=lap.get("elapsed_time", 0),
@@ -337,9 +504,8 @@ class StravaAdapter(RawDataAdapter):
                 avg_hr=lap.get("average_heartrate"),
                 max_hr=lap.get("max_heartrate"),
             )
-            intervals.append(interval_data)
-        
-        return intervals
+            for idx, lap in enumerate(laps)
+        ]
 
 
 class ManualAdapter(RawDataAdapter):
@@ -355,6 +521,21 @@ class ManualAdapter(RawDataAdapter):
     
     source_name = "manual"
     
+    # Raw field -> summary key, copied as-is
+    SUMMARY_FIELDS = (
+        ("heartRate", "avg_hr"),
+        ("rpe", "rpe"),
+        ("notes", "notes"),
+    )
+    
+    # proData field -> summary key (external sync metrics)
+    PRO_DATA_FIELDS = (
+        ("avgPower", "avg_power"),
+        ("normalizedPower", "normalized_power"),
+        ("tss", "tss"),
+        ("maxHr", "max_hr"),
+    )
+    
     def normalize(self, raw_data: Dict[str, Any]) -> NormalizedActivity:
         """Normalize manually entered data."""
         
@@ -376,48 +557,33 @@ class ManualAdapter(RawDataAdapter):
             raw_data=raw_data,
         )
         
-        logger.debug(
-            "Normalized manual activity",
-            activity_type=activity_type,
-            duration=duration_seconds,
-            quality=activity.get_data_quality_score()
-        )
+        if is_debug_enabled(__name__):
+            logger.debug(
+                "Normalized manual activity",
+                activity_type=activity_type,
+                duration=duration_seconds,
+                quality=activity.get_data_quality_score()
+            )
         
         return activity
     
     def _build_summary(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """Build summary from manual entry."""
-        summary = {}
-        
-        if "heartRate" in raw_data:
-            summary["avg_hr"] = raw_data["heartRate"]
-        if "rpe" in raw_data:
-            summary["rpe"] = raw_data["rpe"]
-        if "notes" in raw_data:
-            summary["notes"] = raw_data["notes"]
+        summary = self._copy_fields(raw_data, self.SUMMARY_FIELDS)
         
         # Handle proData if present (from external sync)
         pro_data = raw_data.get("proData", {})
         if pro_data:
-            if "avgPower" in pro_data:
-                summary["avg_power"] = pro_data["avgPower"]
-            if "normalizedPower" in pro_data:
-                summary["normalized_power"] = pro_data["normalizedPower"]
-            if "tss" in pro_data:
-                summary["tss"] = pro_data["tss"]
-            if "maxHr" in pro_data:
-                summary["max_hr"] = pro_data["maxHr"]
+            summary.update(self._copy_fields(pro_data, self.PRO_DATA_FIELDS))
         
         return summary
     
     def _extract_intervals(self, raw_data: Dict[str, Any]) -> List[IntervalData]:
         """Extract intervals from manual entry if present."""
-        intervals = []
-        
         raw_intervals = raw_data.get("intervals") or []
         
-        for idx, interval in enumerate(raw_intervals):
-            interval_data = IntervalData(
+        return [
+            IntervalData(
                 index=idx,
                 interval_type=interval.get("type", "work"),
                 duration_seconds=int(interval.get("duration", 0) * 60),
@@ -426,9 +592,8 @@ class ManualAdapter(RawDataAdapter):
                 rpe=interval.get("rpe"),
                 notes=interval.get("notes"),
             )
-            intervals.append(interval_data)
-        
-        return intervals
+            for idx, interval in enumerate(raw_intervals)
+        ]
 
 
 # Adapter registry
@@ -438,6 +603,11 @@ _ADAPTERS = {
     "manual": ManualAdapter,
 }
 
+# Adapters hold no per-call state, so one shared instance per source
+_ADAPTER_INSTANCES: Dict[str, RawDataAdapter] = {
+    name: adapter_class() for name, adapter_class in _ADAPTERS.items()
+}
+
 
 def get_adapter(source: str) -> RawDataAdapter:
     """
@@ -447,16 +617,12 @@ def get_adapter(source: str) -> RawDataAdapter:
         source: Data source name (intervals, strava, manual)
         
     Returns:
-        Adapter instance
-        
-    Raises:
-        ValueError: If source is not supported
+        Shared adapter instance
     """
-    adapter_class = _ADAPTERS.get(source.lower())
+    adapter = _ADAPTER_INSTANCES.get(source.lower())
     
-    if not adapter_class:
+    if adapter is None:
         logger.warning(f"Unknown data source: {source}, falling back to manual")
-        adapter_class = ManualAdapter
+        adapter = _ADAPTER_INSTANCES["manual"]
     
-    return adapter_class()
-
+    return adapter
@@ -27,6 +27,41 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Strategies are stateless, so all calculators share one instance per type
+_STRATEGIES: Dict[str, ActivityStrategy] = {
+    "cycling": CyclingStrategy(),
+    "running": RunningStrategy(),
+    "strength": StrengthStrategy(),
+}
+
+# Default strategy for unknown types
+_DEFAULT_STRATEGY: ActivityStrategy = _STRATEGIES["running"]  # Generic enough for most activities
+
+# Prompt line templates, in display order: (stats key, line template)
+_L1_TEMPLATES = (
+    ("duration_min", "- 时长: {} 分钟"),
+    ("avg_hr", "- 平均心率: {} bpm"),
+    ("avg_power", "- 平均功率: {} W"),
+    ("normalized_power", "- 标准化功率: {} W"),
+    ("power_hr_ratio", "- 功率心率比: {}"),
+    ("hr_drift_pct", "- 心率漂移: {}%"),
+    ("tss", "- 训练压力得分 (TSS): {}"),
+    ("rpe_reported", "- 主观疲劳度 (RPE): {}"),
+)
+
+_L2_TEMPLATES = (
+    ("power_drop_last_interval_pct", "- 末尾区间功率下降: {}%"),
+    ("pace_drop_last_interval_pct", "- 末尾区间配速下降: {}%"),
+)
+
+# Event type -> (line template, event fields after timestamp_min)
+_L3_EVENT_TEMPLATES = {
+    "heart_rate_drift_start": ("- 心率漂移开始 @ {}min (HR: {})", ("hr_at_event",)),
+    "power_drop": ("- 功率下降 @ {}min ({}%)", ("drop_pct",)),
+    "pace_drop": ("- 配速下降 @ {}min ({}%)", ("drop_pct",)),
+    "rpe_spike": ("- RPE骤升 @ {}min ({} -> {})", ("rpe_before", "rpe_after")),
+}
+
 
 class StatsCalculator:
     """
@@ -44,16 +79,6 @@ class StatsCalculator:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.store = StatsStore(db)
-        
-        # Initialize strategies
-        self._strategies: Dict[str, ActivityStrategy] = {
-            "cycling": CyclingStrategy(),
-            "running": RunningStrategy(),
-            "strength": StrengthStrategy(),
-        }
-        
-        # Default strategy for unknown types
-        self._default_strategy = RunningStrategy()  # Generic enough for most activities
     
     async def compute_and_store(
         self,
@@ -85,9 +110,10 @@ class StatsCalculator:
         strategy = self._get_strategy(activity.activity_type)
         
         # Step 3: Compute all levels
-        level1 = strategy.compute_level1(activity)
-        level2 = strategy.compute_level2(activity)
-        level3 = strategy.compute_level3(activity)
+        levels = strategy.compute_all(activity)
+        level1 = levels["level1"]
+        level2 = levels["level2"]
+        level3 = levels["level3"]
         
         # Step 4: Store
         stats = await self.store.save(
@@ -166,14 +192,14 @@ class StatsCalculator:
     
     def _get_strategy(self, activity_type: str) -> ActivityStrategy:
         """Get strategy for activity type."""
-        strategy = self._strategies.get(activity_type)
+        strategy = _STRATEGIES.get(activity_type)
         
         if not strategy:
             logger.debug(
                 "No specific strategy for activity type, using default",
                 activity_type=activity_type
             )
-            return self._default_strategy
+            return _DEFAULT_STRATEGY
         
         return strategy
     
@@ -206,57 +232,40 @@ class StatsCalculator:
         Returns:
             Formatted string for prompt
         """
-        lines = ["### 运动数据统计"]
+        lines = ["### 运动数据统计", "\n**基础统计:**"]
         
         # Level 1 summary
         l1 = stats.level1_stats
-        lines.append("\n**基础统计:**")
-        
-        if "duration_min" in l1:
-            lines.append(f"- 时长: {l1['duration_min']} 分钟")
-        if "avg_hr" in l1:
-            lines.append(f"- 平均心率: {l1['avg_hr']} bpm")
-        if "avg_power" in l1:
-            lines.append(f"- 平均功率: {l1['avg_power']} W")
-        if "normalized_power" in l1:
-            lines.append(f"- 标准化功率: {l1['normalized_power']} W")
-        if "power_hr_ratio" in l1:
-            lines.append(f"- 功率心率比: {l1['power_hr_ratio']}")
-        if "hr_drift_pct" in l1:
-            lines.append(f"- 心率漂移: {l1['hr_drift_pct']}%")
-        if "tss" in l1:
-            lines.append(f"- 训练压力得分 (TSS): {l1['tss']}")
-        if "rpe_reported" in l1:
-            lines.append(f"- 主观疲劳度 (RPE): {l1['rpe_reported']}")
+        lines.extend(
+            template.format(l1[key])
+            for key, template in _L1_TEMPLATES
+            if key in l1
+        )
         
         # Level 2 interval summary
         l2 = stats.level2_stats
         if l2.get("intervals"):
-            interval_count = len(l2["intervals"])
-            lines.append(f"\n**区间统计:**")
-            lines.append(f"- 区间数量: {interval_count}")
-            
-            if "power_drop_last_interval_pct" in l2:
-                lines.append(f"- 末尾区间功率下降: {l2['power_drop_last_interval_pct']}%")
-            if "pace_drop_last_interval_pct" in l2:
-                lines.append(f"- 末尾区间配速下降: {l2['pace_drop_last_interval_pct']}%")
+            lines.append("\n**区间统计:**")
+            lines.append(f"- 区间数量: {len(l2['intervals'])}")
+            lines.extend(
+                template.format(l2[key])
+                for key, template in _L2_TEMPLATES
+                if key in l2
+            )
         
         # Level 3 events
         l3 = stats.level3_stats
         if l3.get("events"):
-            lines.append(f"\n**检测到的事件:**")
+            lines.append("\n**检测到的事件:**")
             for event in l3["events"][:3]:  # Limit to top 3
-                event_type = event.get("event", "unknown")
-                timestamp = event.get("timestamp_min", 0)
-                
-                if event_type == "heart_rate_drift_start":
-                    lines.append(f"- 心率漂移开始 @ {timestamp}min (HR: {event.get('hr_at_event')})")
-                elif event_type == "power_drop":
-                    lines.append(f"- 功率下降 @ {timestamp}min ({event.get('drop_pct')}%)")
-                elif event_type == "pace_drop":
-                    lines.append(f"- 配速下降 @ {timestamp}min ({event.get('drop_pct')}%)")
-                elif event_type == "rpe_spike":
-                    lines.append(f"- RPE骤升 @ {timestamp}min ({event.get('rpe_before')} -> {event.get('rpe_after')})")
+                entry = _L3_EVENT_TEMPLATES.get(event.get("event", "unknown"))
+                if entry is None:
+                    continue
+                template, fields = entry
+                lines.append(template.format(
+                    event.get("timestamp_min", 0),
+                    *(event.get(f) for f in fields)
+                ))
         
         lines.append(f"\n**数据质量得分:** {stats.data_quality_score}")
         
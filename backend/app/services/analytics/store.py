@@ -2,18 +2,32 @@
 Stats Store - Database operations for workout statistics.
 """
 import uuid
-from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.stats import WorkoutStats
-from app.core.logging import get_logger
+from app.core.logging import get_logger, is_debug_enabled
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> uuid.UUID:
+    """Parse a UUID string, memoizing recently seen IDs."""
+    return uuid.UUID(value)
+
+
+def _to_uuid(record_id: Union[str, uuid.UUID]) -> uuid.UUID:
+    """Convert a record ID to UUID, parsing strings at most once."""
+    if isinstance(record_id, uuid.UUID):
+        return record_id
+    return _parse_uuid(record_id)
+
+
 class StatsStore:
     """
     Database store for workout statistics.
@@ -24,7 +38,10 @@ class StatsStore:
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def get_by_record_id(self, record_id: str) -> Optional[WorkoutStats]:
+    async def get_by_record_id(
+        self,
+        record_id: Union[str, uuid.UUID]
+    ) -> Optional[WorkoutStats]:
         """
         Get stats by workout record ID.
         
@@ -35,7 +52,7 @@ class StatsStore:
             WorkoutStats or None if not found
         """
         try:
-            record_uuid = uuid.UUID(record_id)
+            record_uuid = _to_uuid(record_id)
         except ValueError:
             logger.warning("Invalid record_id format", record_id=record_id)
             return None
@@ -47,7 +64,7 @@ class StatsStore:
     
     async def save(
         self,
-        record_id: str,
+        record_id: Union[str, uuid.UUID],
         activity_type: str,
         level1_stats: Dict[str, Any],
         level2_stats: Dict[str, Any],
@@ -73,36 +90,14 @@ class StatsStore:
             Created or updated WorkoutStats
         """
         try:
-            record_uuid = uuid.UUID(record_id)
+            record_uuid = _to_uuid(record_id)
         except ValueError:
             raise ValueError(f"Invalid record_id format: {record_id}")
         
-        # Check if stats already exist
-        existing = await self.get_by_record_id(record_id)
-        
-        if existing:
-            # Update existing
-            existing.activity_type = activity_type
-            existing.level1_stats = level1_stats
-            existing.level2_stats = level2_stats
-            existing.level3_stats = level3_stats
-            existing.data_source = data_source
-            existing.data_quality_score = data_quality_score
-            existing.computed_at = datetime.utcnow()
-            
-            await self.db.commit()
-            await self.db.refresh(existing)
-            
-            logger.debug(
-                "Updated workout stats",
-                record_id=record_id,
-                activity_type=activity_type
-            )
-            
-            return existing
-        
-        # Create new
-        stats = WorkoutStats(
+        # Single-statement upsert: no SELECT beforehand, and concurrent
+        # recomputes of the same record don't race between read and write.
+        # RETURNING loads the resulting row in the same round-trip.
+        stmt = insert(WorkoutStats).values(
             record_id=record_uuid,
             activity_type=activity_type,
             level1_stats=level1_stats,
@@ -110,22 +105,39 @@ class StatsStore:
             level3_stats=level3_stats,
             data_source=data_source,
             data_quality_score=data_quality_score,
+            # Stamped by the database so app instances can't skew it;
+            # naive UTC to match the column's datetime.utcnow default
+            computed_at=func.timezone('utc', func.now()),
         )
         
-        self.db.add(stats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['record_id'],
+            set_={
+                'activity_type': stmt.excluded.activity_type,
+                'level1_stats': stmt.excluded.level1_stats,
+                'level2_stats': stmt.excluded.level2_stats,
+                'level3_stats': stmt.excluded.level3_stats,
+                'data_source': stmt.excluded.data_source,
+                'data_quality_score': stmt.excluded.data_quality_score,
+                'computed_at': stmt.excluded.computed_at,
+            }
+        ).returning(WorkoutStats).execution_options(populate_existing=True)
+        
+        result = await self.db.execute(stmt)
+        stats = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(stats)
         
-        logger.debug(
-            "Created workout stats",
-            record_id=record_id,
-            stats_id=str(stats.id),
-            activity_type=activity_type
-        )
+        if is_debug_enabled(__name__):
+            logger.debug(
+                "Saved workout stats",
+                record_id=record_id,
+                stats_id=str(stats.id),
+                activity_type=activity_type
+            )
         
         return stats
     
-    async def delete_by_record_id(self, record_id: str) -> bool:
+    async def delete_by_record_id(self, record_id: Union[str, uuid.UUID]) -> bool:
         """
         Delete stats by workout record ID.
         
@@ -136,7 +148,7 @@ class StatsStore:
             True if deleted, False if not found
         """
         try:
-            record_uuid = uuid.UUID(record_id)
+            record_uuid = _to_uuid(record_id)
         except ValueError:
             return False
         
@@ -147,7 +159,7 @@ class StatsStore:
         
         return result.rowcount > 0
     
-    async def exists(self, record_id: str) -> bool:
+    async def exists(self, record_id: Union[str, uuid.UUID]) -> bool:
         """
         Check if stats exist for a record.
         
@@ -2,9 +2,11 @@
 Base Strategy - Abstract interface for activity-specific calculations.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from app.services.analytics.adapter import NormalizedActivity, IntervalData
+from app.services.analytics.adapter import NormalizedActivity, IntervalArrays
 
 
 class ActivityStrategy(ABC):
@@ -17,6 +19,9 @@ class ActivityStrategy(ABC):
     - Level 3: Event detection
     """
     
+    # Strategies are stateless singletons; no per-instance __dict__
+    __slots__ = ()
+    
     activity_type: str = "unknown"
     
     @abstractmethod
@@ -62,6 +67,8 @@ class ActivityStrategy(ABC):
         """
         Compute all three levels of statistics.
         
+        Preferred entry point when every level is needed.
+        
         Args:
             activity: Normalized activity data
             
@@ -80,7 +87,7 @@ class ActivityStrategy(ABC):
     
     def _compute_hr_drift(
         self,
-        intervals: List[IntervalData],
+        arrays: IntervalArrays,
         duration_seconds: int
     ) -> Optional[float]:
         """
@@ -89,33 +96,30 @@ class ActivityStrategy(ABC):
         HR drift = (second_half_avg_hr - first_half_avg_hr) / first_half_avg_hr * 100
         
         Args:
-            intervals: List of intervals with HR data
+            arrays: Interval columns with HR data
             duration_seconds: Total duration
             
         Returns:
             HR drift percentage or None if insufficient data
         """
-        if not intervals or len(intervals) < 2:
+        if len(arrays) < 2:
             return None
         
-        # Filter intervals with HR data
-        hr_intervals = [i for i in intervals if i.avg_hr is not None]
+        # Intervals with HR data (filtered once, shared across levels)
+        hr_rows = arrays.where_present("avg_hr")
         
-        if len(hr_intervals) < 2:
+        if len(hr_rows) < 2:
             return None
         
-        # Split into first and second half by time
-        mid_point = duration_seconds / 2
-        cumulative_time = 0
-        first_half_hrs = []
-        second_half_hrs = []
+        # Split into first and second half by time: an interval belongs to
+        # the first half if it starts before the midpoint. Start times are
+        # non-decreasing, so the split is a binary search over them.
+        hrs, durations = hr_rows.avg_hr, hr_rows.durations
+        start_times = list(accumulate(durations[:-1], initial=0))
+        split = bisect_left(start_times, duration_seconds / 2)
         
-        for interval in hr_intervals:
-            if cumulative_time < mid_point:
-                first_half_hrs.append(interval.avg_hr)
-            else:
-                second_half_hrs.append(interval.avg_hr)
-            cumulative_time += interval.duration_seconds
+        first_half_hrs = hrs[:split]
+        second_half_hrs = hrs[split:]
         
         if not first_half_hrs or not second_half_hrs:
             return None
@@ -177,114 +181,160 @@ class ActivityStrategy(ABC):
         # Simplified TSS formula
         return round(duration_minutes * (intensity ** 2) * 10, 1)
     
-    def _detect_power_drop_intervals(
-        self,
-        intervals: List[IntervalData],
-        threshold_pct: float = 5.0
-    ) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _weighted_mean(values: Sequence[float], weights: Sequence[int]) -> float:
         """
-        Detect intervals with significant power drops.
+        Duration-weighted mean of values.
+        
+        Falls back to the plain mean when no interval has a duration,
+        so sources that omit durations still get a baseline.
         
         Args:
-            intervals: List of intervals
-            threshold_pct: Drop threshold percentage
+            values: Non-empty per-interval values
+            weights: Per-interval durations, aligned with values
             
         Returns:
-            List of events with power drop info
+            Weighted mean
+        """
+        total_weight = sum(weights)
+        if total_weight == 0:
+            return sum(values) / len(values)
+        return sum(v * w for v, w in zip(values, weights)) / total_weight
+    
+    @staticmethod
+    def _find_drops(
+        values: Sequence[float],
+        durations: Sequence[int],
+        threshold_pct: float,
+        increase_is_drop: bool = False
+    ) -> List[Tuple[int, float, int]]:
         """
-        events = []
+        Scan a metric series for drops against its first-half baseline.
         
-        power_intervals = [i for i in intervals if i.avg_power is not None]
+        Shared numeric core of the power and pace drop detectors. Works on
+        plain columns only; callers build event dicts from the result.
         
-        if len(power_intervals) < 2:
-            return events
+        Args:
+            values: Metric values (no missing entries)
+            durations: Duration of each value's interval in seconds
+            threshold_pct: Drop threshold percentage
+            increase_is_drop: True when higher values are worse (pace)
+            
+        Returns:
+            (position, drop_pct, start_time_seconds) for each drop
+        """
+        n = len(values)
+        if n < 2:
+            return []
         
         # Calculate baseline (average of first half)
-        mid_idx = len(power_intervals) // 2
-        if mid_idx == 0:
-            mid_idx = 1
+        mid_idx = n // 2
+        baseline = sum(values[:mid_idx]) / mid_idx
         
-        baseline_power = sum(i.avg_power for i in power_intervals[:mid_idx]) / mid_idx
+        if baseline == 0:
+            return []
         
-        if baseline_power == 0:
-            return events
+        sign = 1 if increase_is_drop else -1
+        cumulative_time = sum(durations[:mid_idx])
+        drops = []
         
-        # Detect drops
-        cumulative_time = sum(i.duration_seconds for i in power_intervals[:mid_idx])
-        
-        for interval in power_intervals[mid_idx:]:
-            drop_pct = (baseline_power - interval.avg_power) / baseline_power * 100
+        for pos in range(mid_idx, n):
+            drop_pct = sign * (values[pos] - baseline) / baseline * 100
             
             if drop_pct >= threshold_pct:
-                events.append({
-                    "timestamp_min": round(cumulative_time / 60, 1),
-                    "event": "power_drop",
-                    "drop_pct": round(drop_pct, 1),
-                    "power_at_event": interval.avg_power,
-                    "interval_index": interval.index,
-                })
+                drops.append((pos, drop_pct, cumulative_time))
             
-            cumulative_time += interval.duration_seconds
+            cumulative_time += durations[pos]
         
-        return events
+        return drops
+    
+    def _detect_power_drop_intervals(
+        self,
+        arrays: IntervalArrays,
+        threshold_pct: float = 5.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect intervals with significant power drops.
+        
+        Args:
+            arrays: Interval columns
+            threshold_pct: Drop threshold percentage
+            
+        Returns:
+            List of events with power drop info
+        """
+        power_rows = arrays.where_present("avg_power")
+        
+        if len(power_rows) < 2:
+            return []
+        
+        powers, durations, indices = power_rows.avg_power, power_rows.durations, power_rows.index
+        
+        return [
+            {
+                "timestamp_min": round(start_time / 60, 1),
+                "event": "power_drop",
+                "drop_pct": round(drop_pct, 1),
+                "power_at_event": powers[pos],
+                "interval_index": indices[pos],
+            }
+            for pos, drop_pct, start_time in self._find_drops(powers, durations, threshold_pct)
+        ]
     
     def _detect_hr_drift_start(
         self,
-        intervals: List[IntervalData],
+        arrays: IntervalArrays,
         threshold_pct: float = 5.0
     ) -> Optional[Dict[str, Any]]:
         """
         Detect when HR drift begins (HR rises without power increase).
         
         Args:
-            intervals: List of intervals
+            arrays: Interval columns
             threshold_pct: Drift threshold percentage
             
         Returns:
             Event dict or None
         """
-        hr_intervals = [(i, i.avg_hr, i.avg_power) 
-                        for i in intervals 
-                        if i.avg_hr is not None]
+        hr_rows = arrays.where_present("avg_hr")
         
-        if len(hr_intervals) < 3:
+        if len(hr_rows) < 3:
             return None
         
+        hrs, powers, durations = hr_rows.avg_hr, hr_rows.avg_power, hr_rows.durations
+        
         # Calculate initial baseline from first 2 intervals
-        baseline_hr = sum(x[1] for x in hr_intervals[:2]) / 2
+        baseline_hr = (hrs[0] + hrs[1]) / 2
         baseline_power = None
-        if all(x[2] is not None for x in hr_intervals[:2]):
-            baseline_power = sum(x[2] for x in hr_intervals[:2]) / 2
+        if powers[0] is not None and powers[1] is not None:
+            baseline_power = (powers[0] + powers[1]) / 2
         
         if baseline_hr == 0:
             return None
         
-        cumulative_time = sum(x[0].duration_seconds for x in hr_intervals[:2])
-        
-        # Look for drift
-        for interval, hr, power in hr_intervals[2:]:
+        # Look for drift. Only positions where HR rose past the threshold
+        # need the power check, and the start time is summed on a hit
+        # instead of being accumulated every interval.
+        for position, hr in enumerate(hrs[2:], start=2):
             hr_increase_pct = (hr - baseline_hr) / baseline_hr * 100
+            if hr_increase_pct < threshold_pct:
+                continue
             
-            # Check if HR increased significantly
-            if hr_increase_pct >= threshold_pct:
-                # If we have power data, check if it's cardiac drift (HR up, power same/down)
-                is_drift = True
-                if baseline_power is not None and power is not None:
-                    power_change_pct = (power - baseline_power) / baseline_power * 100
-                    # If power also increased proportionally, it's not drift
-                    if power_change_pct >= hr_increase_pct * 0.5:
-                        is_drift = False
-                
-                if is_drift:
-                    return {
-                        "timestamp_min": round(cumulative_time / 60, 1),
-                        "event": "heart_rate_drift_start",
-                        "hr_at_event": hr,
-                        "power_at_event": power,
-                        "hr_increase_pct": round(hr_increase_pct, 1),
-                    }
+            # If we have power data, check if it's cardiac drift (HR up, power same/down)
+            power = powers[position]
+            if baseline_power is not None and power is not None:
+                power_change_pct = (power - baseline_power) / baseline_power * 100
+                # If power also increased proportionally, it's not drift
+                if power_change_pct >= hr_increase_pct * 0.5:
+                    continue
             
-            cumulative_time += interval.duration_seconds
+            return {
+                "timestamp_min": round(sum(durations[:position]) / 60, 1),
+                "event": "heart_rate_drift_start",
+                "hr_at_event": hr,
+                "power_at_event": power,
+                "hr_increase_pct": round(hr_increase_pct, 1),
+            }
         
         return None
 
@@ -6,11 +6,22 @@ Cycling-specific metrics:
 - Power/HR ratio (efficiency)
 - Power drops and fatigue detection
 """
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
-from app.services.analytics.adapter import NormalizedActivity, IntervalData
+from app.services.analytics.adapter import NormalizedActivity, IntervalArrays
 from app.services.analytics.strategies.base import ActivityStrategy
 
+# Interval types counted as work efforts for power drop analysis
+WORK_INTERVAL_TYPES = frozenset({"work", "threshold", "vo2max"})
+
+
+@lru_cache(maxsize=64)
+def _tss_scale(ftp: float) -> float:
+    """TSS per (second * watt^2) for an FTP: 100 / (FTP^2 * 3600)."""
+    return 100.0 / (ftp * ftp * 3600.0)
+
 
 class CyclingStrategy(ActivityStrategy):
     """
@@ -19,6 +30,8 @@ class CyclingStrategy(ActivityStrategy):
     Power is the primary metric for cycling analysis.
     """
     
+    __slots__ = ()
+    
     activity_type = "cycling"
     
     # Default FTP for TSS calculation when not known
@@ -38,10 +51,12 @@ class CyclingStrategy(ActivityStrategy):
         - rpe_reported
         - completion_rate
         """
-        stats: Dict[str, Any] = {}
-        
-        # Duration
-        stats["duration_min"] = round(activity.duration_seconds / 60, 1)
+        # Unconditional fields go in the literal; optional ones are added below
+        stats: Dict[str, Any] = {
+            "duration_min": round(activity.duration_seconds / 60, 1),
+        }
+        has_intervals = activity.has_intervals()
+        arrays = activity.get_interval_arrays() if has_intervals else None
         
         # Heart rate
         if "avg_hr" in activity.summary:
@@ -57,9 +72,9 @@ class CyclingStrategy(ActivityStrategy):
         np = activity.summary.get("normalized_power")
         if np:
             stats["normalized_power"] = np
-        elif avg_power and activity.has_intervals():
+        elif avg_power and has_intervals:
             # Estimate NP from intervals if not provided
-            np = self._estimate_np_from_intervals(activity.intervals)
+            np = self._estimate_np_from_intervals(arrays)
             if np:
                 stats["normalized_power"] = np
         
@@ -67,10 +82,11 @@ class CyclingStrategy(ActivityStrategy):
         if avg_power and stats.get("avg_hr"):
             stats["power_hr_ratio"] = round(avg_power / stats["avg_hr"], 2)
         
-        # HR drift
-        hr_drift = self._compute_hr_drift(activity.intervals, activity.duration_seconds)
-        if hr_drift is not None:
-            stats["hr_drift_pct"] = hr_drift
+        # HR drift (interval-derived; skipped for summary-only activities)
+        if has_intervals:
+            hr_drift = self._compute_hr_drift(arrays, activity.duration_seconds)
+            if hr_drift is not None:
+                stats["hr_drift_pct"] = hr_drift
         
         # TSS
         tss = activity.summary.get("tss")
@@ -115,48 +131,49 @@ class CyclingStrategy(ActivityStrategy):
         if not activity.has_intervals():
             return stats
         
-        intervals = activity.intervals
+        arrays = activity.get_interval_arrays()
         
         # Process each interval
         interval_stats = []
-        for interval in intervals:
+        for interval_type, duration, power, hr, target_power in zip(
+            arrays.interval_type,
+            arrays.durations,
+            arrays.avg_power,
+            arrays.avg_hr,
+            arrays.target_power,
+        ):
             interval_stat = {
-                "type": interval.interval_type,
-                "duration_sec": interval.duration_seconds,
+                "type": interval_type,
+                "duration_sec": duration,
             }
             
-            if interval.avg_power is not None:
-                interval_stat["avg_power"] = interval.avg_power
-            if interval.avg_hr is not None:
-                interval_stat["avg_hr"] = interval.avg_hr
-            if interval.target_power:
-                interval_stat["target_power"] = interval.target_power
+            if power is not None:
+                interval_stat["avg_power"] = power
+            if hr is not None:
+                interval_stat["avg_hr"] = hr
+            if target_power:
+                interval_stat["target_power"] = target_power
             
             interval_stats.append(interval_stat)
         
         stats["intervals"] = interval_stats
         
         # Power drop on last interval
-        power_intervals = [i for i in intervals if i.avg_power is not None]
-        if len(power_intervals) >= 2:
-            # Compare last work interval to average of previous work intervals
-            work_intervals = [i for i in power_intervals 
-                            if i.interval_type in ("work", "threshold", "vo2max")]
+        # Compare last work interval to the duration-weighted average of
+        # previous work intervals
+        work = arrays.where_type(WORK_INTERVAL_TYPES).where_present("avg_power")
+        work_powers = work.avg_power
+        
+        if len(work_powers) >= 2:
+            last_power = work_powers[-1]
+            prev_avg = self._weighted_mean(work_powers[:-1], work.durations[:-1])
             
-            if len(work_intervals) >= 2:
-                last_power = work_intervals[-1].avg_power
-                prev_avg = sum(i.avg_power for i in work_intervals[:-1]) / (len(work_intervals) - 1)
-                
-                if prev_avg > 0:
-                    drop_pct = (prev_avg - last_power) / prev_avg * 100
-                    stats["power_drop_last_interval_pct"] = round(drop_pct, 1)
+            if prev_avg > 0:
+                drop_pct = (prev_avg - last_power) / prev_avg * 100
+                stats["power_drop_last_interval_pct"] = round(drop_pct, 1)
         
         # Interval type counts
-        type_counts = {}
-        for interval in intervals:
-            t = interval.interval_type
-            type_counts[t] = type_counts.get(t, 0) + 1
-        stats["interval_type_counts"] = type_counts
+        stats["interval_type_counts"] = dict(Counter(arrays.interval_type))
         
         return stats
     
@@ -174,14 +191,15 @@ class CyclingStrategy(ActivityStrategy):
             return stats
         
         events = []
+        arrays = activity.get_interval_arrays()
         
         # Detect HR drift start
-        drift_event = self._detect_hr_drift_start(activity.intervals)
+        drift_event = self._detect_hr_drift_start(arrays)
         if drift_event:
             events.append(drift_event)
         
         # Detect power drops
-        power_drops = self._detect_power_drop_intervals(activity.intervals)
+        power_drops = self._detect_power_drop_intervals(arrays)
         events.extend(power_drops)
         
         # Sort events by timestamp
@@ -197,7 +215,7 @@ class CyclingStrategy(ActivityStrategy):
     
     def _estimate_np_from_intervals(
         self,
-        intervals: List[IntervalData]
+        arrays: IntervalArrays
     ) -> Optional[float]:
         """
         Estimate Normalized Power from interval data.
@@ -206,23 +224,23 @@ class CyclingStrategy(ActivityStrategy):
         True NP requires second-by-second data with 30s rolling average.
         This is a simplified approximation.
         """
-        power_intervals = [(i.avg_power, i.duration_seconds) 
-                          for i in intervals 
-                          if i.avg_power is not None]
+        power_rows = arrays.where_present("avg_power")
         
-        if not power_intervals:
+        if not power_rows:
             return None
         
         # Weighted average of power^4, then take 4th root
-        total_time = sum(d for _, d in power_intervals)
+        total_time = sum(power_rows.durations)
         
         if total_time == 0:
             return None
         
+        # Accumulate sum(p^4 * d) and divide once, not per interval.
+        # p^4 as (p*p)^2 is two multiplies instead of a pow() call.
         weighted_power4 = sum(
-            (p ** 4) * d / total_time 
-            for p, d in power_intervals
-        )
+            (p * p) * (p * p) * d
+            for p, d in zip(power_rows.avg_power, power_rows.durations)
+        ) / total_time
         
         return round(weighted_power4 ** 0.25, 1)
     
@@ -237,13 +255,14 @@ class CyclingStrategy(ActivityStrategy):
         
         TSS = (duration_seconds * NP * IF) / (FTP * 3600) * 100
         where IF (Intensity Factor) = NP / FTP
+        
+        which simplifies to duration_seconds * NP^2 * 100 / (FTP^2 * 3600);
+        the FTP-only factor is cached per FTP.
         """
         if ftp == 0:
             return 0.0
         
-        intensity_factor = normalized_power / ftp
-        
-        tss = (duration_seconds * normalized_power * intensity_factor) / (ftp * 3600) * 100
+        tss = duration_seconds * normalized_power * normalized_power * _tss_scale(ftp)
         
         return round(tss, 1)
 
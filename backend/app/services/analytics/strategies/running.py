@@ -6,11 +6,20 @@ Running-specific metrics:
 - Heart rate zones
 - Cardiac drift analysis
 """
+from bisect import bisect_right
 from typing import Any, Dict, List, Optional
 
-from app.services.analytics.adapter import NormalizedActivity, IntervalData
+from app.services.analytics.adapter import NormalizedActivity, IntervalArrays
 from app.services.analytics.strategies.base import ActivityStrategy
 
+# HR zone lower bounds for Z2-Z5 (assuming max HR 190):
+# Z1 < 114, Z2 114-133, Z3 133-152, Z4 152-171, Z5 171+
+HR_ZONE_BOUNDS = (114, 133, 152, 171)
+HR_ZONE_NAMES = ("Z1", "Z2", "Z3", "Z4", "Z5")
+
+# Interval types counted as work efforts for pace drop analysis
+WORK_INTERVAL_TYPES = frozenset({"work", "threshold", "tempo"})
+
 
 class RunningStrategy(ActivityStrategy):
     """
@@ -19,6 +28,8 @@ class RunningStrategy(ActivityStrategy):
     Pace and heart rate are primary metrics for running analysis.
     """
     
+    __slots__ = ()
+    
     activity_type = "running"
     
     def compute_level1(self, activity: NormalizedActivity) -> Dict[str, Any]:
@@ -34,10 +45,10 @@ class RunningStrategy(ActivityStrategy):
         - rpe_reported
         - completion_rate
         """
-        stats: Dict[str, Any] = {}
-        
-        # Duration
-        stats["duration_min"] = round(activity.duration_seconds / 60, 1)
+        # Unconditional fields go in the literal; optional ones are added below
+        stats: Dict[str, Any] = {
+            "duration_min": round(activity.duration_seconds / 60, 1),
+        }
         
         # Heart rate
         if "avg_hr" in activity.summary:
@@ -63,10 +74,14 @@ class RunningStrategy(ActivityStrategy):
         if "elevation_m" in activity.summary:
             stats["elevation_m"] = activity.summary["elevation_m"]
         
-        # HR drift
-        hr_drift = self._compute_hr_drift(activity.intervals, activity.duration_seconds)
-        if hr_drift is not None:
-            stats["hr_drift_pct"] = hr_drift
+        # HR drift (interval-derived; skipped for summary-only activities)
+        if activity.has_intervals():
+            hr_drift = self._compute_hr_drift(
+                activity.get_interval_arrays(),
+                activity.duration_seconds
+            )
+            if hr_drift is not None:
+                stats["hr_drift_pct"] = hr_drift
         
         # TSS estimation for running
         tss = activity.summary.get("tss")
@@ -107,44 +122,49 @@ class RunningStrategy(ActivityStrategy):
         if not activity.has_intervals():
             return stats
         
-        intervals = activity.intervals
+        arrays = activity.get_interval_arrays()
         
         # Process each interval
         interval_stats = []
-        for interval in intervals:
+        for interval_type, duration, pace, hr, max_hr in zip(
+            arrays.interval_type,
+            arrays.durations,
+            arrays.avg_pace,
+            arrays.avg_hr,
+            arrays.max_hr,
+        ):
             interval_stat = {
-                "type": interval.interval_type,
-                "duration_sec": interval.duration_seconds,
+                "type": interval_type,
+                "duration_sec": duration,
             }
             
-            if interval.avg_pace is not None:
-                interval_stat["avg_pace"] = interval.avg_pace
-            if interval.avg_hr is not None:
-                interval_stat["avg_hr"] = interval.avg_hr
-            if interval.max_hr is not None:
-                interval_stat["max_hr"] = interval.max_hr
+            if pace is not None:
+                interval_stat["avg_pace"] = pace
+            if hr is not None:
+                interval_stat["avg_hr"] = hr
+            if max_hr is not None:
+                interval_stat["max_hr"] = max_hr
             
             interval_stats.append(interval_stat)
         
         stats["intervals"] = interval_stats
         
-        # Pace drop on last interval
-        pace_intervals = [i for i in intervals if i.avg_pace is not None]
-        if len(pace_intervals) >= 2:
-            work_intervals = [i for i in pace_intervals 
-                            if i.interval_type in ("work", "threshold", "tempo")]
+        # Pace drop on last interval, against the duration-weighted
+        # average of previous work intervals
+        work = arrays.where_type(WORK_INTERVAL_TYPES).where_present("avg_pace")
+        work_paces = work.avg_pace
+        
+        if len(work_paces) >= 2:
+            last_pace = work_paces[-1]
+            prev_avg = self._weighted_mean(work_paces[:-1], work.durations[:-1])
             
-            if len(work_intervals) >= 2:
-                last_pace = work_intervals[-1].avg_pace
-                prev_avg = sum(i.avg_pace for i in work_intervals[:-1]) / (len(work_intervals) - 1)
-                
-                if prev_avg > 0:
-                    # For pace, higher = slower, so drop is negative pace change
-                    drop_pct = (last_pace - prev_avg) / prev_avg * 100
-                    stats["pace_drop_last_interval_pct"] = round(drop_pct, 1)
+            if prev_avg > 0:
+                # For pace, higher = slower, so drop is negative pace change
+                drop_pct = (last_pace - prev_avg) / prev_avg * 100
+                stats["pace_drop_last_interval_pct"] = round(drop_pct, 1)
         
         # HR zones distribution
-        hr_zones = self._calculate_hr_zone_distribution(intervals)
+        hr_zones = self._calculate_hr_zone_distribution(arrays)
         if hr_zones:
             stats["hr_zone_distribution"] = hr_zones
         
@@ -164,14 +184,15 @@ class RunningStrategy(ActivityStrategy):
             return stats
         
         events = []
+        arrays = activity.get_interval_arrays()
         
         # Detect HR drift (cardiac decoupling)
-        drift_event = self._detect_hr_drift_start(activity.intervals)
+        drift_event = self._detect_hr_drift_start(arrays)
         if drift_event:
             events.append(drift_event)
         
         # Detect pace drops
-        pace_drops = self._detect_pace_drop_intervals(activity.intervals)
+        pace_drops = self._detect_pace_drop_intervals(arrays)
         events.extend(pace_drops)
         
         events.sort(key=lambda x: x.get("timestamp_min", 0))
@@ -211,7 +232,7 @@ class RunningStrategy(ActivityStrategy):
     
     def _calculate_hr_zone_distribution(
         self,
-        intervals: List[IntervalData]
+        arrays: IntervalArrays
     ) -> Optional[Dict[str, float]]:
         """
         Calculate time distribution across HR zones.
@@ -225,85 +246,52 @@ class RunningStrategy(ActivityStrategy):
         
         Using HR values directly (assuming max HR ~190)
         """
-        hr_intervals = [(i.avg_hr, i.duration_seconds) 
-                       for i in intervals 
-                       if i.avg_hr is not None]
+        hr_rows = arrays.where_present("avg_hr")
         
-        if not hr_intervals:
+        if not hr_rows:
             return None
         
-        total_time = sum(d for _, d in hr_intervals)
+        total_time = sum(hr_rows.durations)
         
         if total_time == 0:
             return None
         
-        # HR thresholds (assuming max HR 190)
-        zones = {
-            "Z1": 0,  # < 114
-            "Z2": 0,  # 114-133
-            "Z3": 0,  # 133-152
-            "Z4": 0,  # 152-171
-            "Z5": 0,  # 171+
-        }
-        
-        for hr, duration in hr_intervals:
-            if hr < 114:
-                zones["Z1"] += duration
-            elif hr < 133:
-                zones["Z2"] += duration
-            elif hr < 152:
-                zones["Z3"] += duration
-            elif hr < 171:
-                zones["Z4"] += duration
-            else:
-                zones["Z5"] += duration
+        # Time per zone, found by binary search over the zone bounds
+        zone_times = [0] * len(HR_ZONE_NAMES)
+        for hr, duration in zip(hr_rows.avg_hr, hr_rows.durations):
+            zone_times[bisect_right(HR_ZONE_BOUNDS, hr)] += duration
         
         # Convert to percentages
         return {
             zone: round(time / total_time * 100, 1)
-            for zone, time in zones.items()
+            for zone, time in zip(HR_ZONE_NAMES, zone_times)
         }
     
     def _detect_pace_drop_intervals(
         self,
-        intervals: List[IntervalData],
+        arrays: IntervalArrays,
         threshold_pct: float = 5.0
     ) -> List[Dict[str, Any]]:
         """
         Detect intervals with significant pace drops (getting slower).
         """
-        events = []
+        pace_rows = arrays.where_present("avg_pace")
         
-        pace_intervals = [i for i in intervals if i.avg_pace is not None]
+        if len(pace_rows) < 2:
+            return []
         
-        if len(pace_intervals) < 2:
-            return events
+        paces, durations, indices = pace_rows.avg_pace, pace_rows.durations, pace_rows.index
         
-        mid_idx = len(pace_intervals) // 2
-        if mid_idx == 0:
-            mid_idx = 1
-        
-        baseline_pace = sum(i.avg_pace for i in pace_intervals[:mid_idx]) / mid_idx
-        
-        if baseline_pace == 0:
-            return events
-        
-        cumulative_time = sum(i.duration_seconds for i in pace_intervals[:mid_idx])
-        
-        for interval in pace_intervals[mid_idx:]:
-            # For pace, higher value = slower, so drop = positive change
-            drop_pct = (interval.avg_pace - baseline_pace) / baseline_pace * 100
-            
-            if drop_pct >= threshold_pct:
-                events.append({
-                    "timestamp_min": round(cumulative_time / 60, 1),
-                    "event": "pace_drop",
-                    "drop_pct": round(drop_pct, 1),
-                    "pace_at_event": interval.avg_pace,
-                    "interval_index": interval.index,
-                })
-            
-            cumulative_time += interval.duration_seconds
-        
-        return events
-
+        # For pace, higher value = slower, so drop = positive change
+        return [
+            {
+                "timestamp_min": round(start_time / 60, 1),
+                "event": "pace_drop",
+                "drop_pct": round(drop_pct, 1),
+                "pace_at_event": paces[pos],
+                "interval_index": indices[pos],
+            }
+            for pos, drop_pct, start_time in self._find_drops(
+                paces, durations, threshold_pct, increase_is_drop=True
+            )
+        ]
@@ -6,12 +6,34 @@ Strength-specific metrics:
 - Volume load (sets × reps × weight)
 - RPE-based intensity
 """
+from itertools import accumulate
 from typing import Any, Dict, List, Optional
 
-from app.services.analytics.adapter import NormalizedActivity, IntervalData
+from app.services.analytics.adapter import NormalizedActivity, IntervalArrays
 from app.services.analytics.strategies.base import ActivityStrategy
 
 
+def strength_tss(duration_min: float, rpe: float) -> float:
+    """
+    Estimate unrounded TSS for a strength session from duration and RPE.
+    
+    Strength training typically has lower TSS per minute due to rest
+    periods and anaerobic nature, so the multiplier is reduced compared
+    to cardio.
+    """
+    if duration_min <= 0:
+        return 0.0
+    
+    # Normalize RPE
+    if rpe < 1:
+        rpe = 1
+    elif rpe > 10:
+        rpe = 10
+    
+    intensity = rpe / 10
+    return duration_min * intensity * intensity * 6
+
+
 class StrengthStrategy(ActivityStrategy):
     """
     Strategy for strength training activity statistics.
@@ -19,6 +41,8 @@ class StrengthStrategy(ActivityStrategy):
     Volume and RPE are primary metrics for strength analysis.
     """
     
+    __slots__ = ()
+    
     activity_type = "strength"
     
     def compute_level1(self, activity: NormalizedActivity) -> Dict[str, Any]:
@@ -34,10 +58,10 @@ class StrengthStrategy(ActivityStrategy):
         - completion_rate
         - total_sets (if interval data available)
         """
-        stats: Dict[str, Any] = {}
-        
-        # Duration
-        stats["duration_min"] = round(activity.duration_seconds / 60, 1)
+        # Unconditional fields go in the literal; optional ones are added below
+        stats: Dict[str, Any] = {
+            "duration_min": round(activity.duration_seconds / 60, 1),
+        }
         
         # Heart rate (often tracked via watch during strength sessions)
         if "avg_hr" in activity.summary:
@@ -83,50 +107,50 @@ class StrengthStrategy(ActivityStrategy):
         if not activity.has_intervals():
             return stats
         
-        intervals = activity.intervals
+        arrays = activity.get_interval_arrays()
         
-        # Process each set/interval
+        # Single pass over the sets: per-set stats, counts per exercise and
+        # running RPE sums/counts per exercise are built together
         interval_stats = []
-        for interval in intervals:
+        exercise_counts: Dict[str, int] = {}
+        rpe_sums: Dict[str, float] = {}
+        rpe_counts: Dict[str, int] = {}
+        for interval_type, duration, notes, rpe, hr in zip(
+            arrays.interval_type,
+            arrays.durations,
+            arrays.notes,
+            arrays.rpe,
+            arrays.avg_hr,
+        ):
             interval_stat = {
-                "type": interval.interval_type,
-                "duration_sec": interval.duration_seconds,
+                "type": interval_type,
+                "duration_sec": duration,
             }
             
             # For strength, interval_type might be exercise name
-            if interval.notes:
-                interval_stat["exercise"] = interval.notes
+            if notes:
+                interval_stat["exercise"] = notes
+            
+            exercise = notes or interval_type
+            exercise_counts[exercise] = exercise_counts.get(exercise, 0) + 1
             
-            if interval.rpe is not None:
-                interval_stat["rpe"] = interval.rpe
+            if rpe is not None:
+                interval_stat["rpe"] = rpe
+                rpe_sums[exercise] = rpe_sums.get(exercise, 0) + rpe
+                rpe_counts[exercise] = rpe_counts.get(exercise, 0) + 1
             
-            if interval.avg_hr is not None:
-                interval_stat["avg_hr"] = interval.avg_hr
+            if hr is not None:
+                interval_stat["avg_hr"] = hr
             
             interval_stats.append(interval_stat)
         
         stats["intervals"] = interval_stats
-        
-        # Group by exercise type
-        exercise_counts = {}
-        exercise_rpe = {}
-        
-        for interval in intervals:
-            exercise = interval.notes or interval.interval_type
-            exercise_counts[exercise] = exercise_counts.get(exercise, 0) + 1
-            
-            if interval.rpe is not None:
-                if exercise not in exercise_rpe:
-                    exercise_rpe[exercise] = []
-                exercise_rpe[exercise].append(interval.rpe)
-        
         stats["exercise_counts"] = exercise_counts
         
-        # Average RPE by exercise
-        if exercise_rpe:
+        if rpe_sums:
             stats["avg_rpe_by_exercise"] = {
-                ex: round(sum(rpes) / len(rpes), 1)
-                for ex, rpes in exercise_rpe.items()
+                ex: round(total / rpe_counts[ex], 1)
+                for ex, total in rpe_sums.items()
             }
         
         return stats
@@ -147,7 +171,7 @@ class StrengthStrategy(ActivityStrategy):
         events = []
         
         # Detect RPE spikes
-        rpe_spikes = self._detect_rpe_spikes(activity.intervals)
+        rpe_spikes = self._detect_rpe_spikes(activity.get_interval_arrays())
         events.extend(rpe_spikes)
         
         events.sort(key=lambda x: x.get("timestamp_min", 0))
@@ -166,34 +190,22 @@ class StrengthStrategy(ActivityStrategy):
         rpe: float
     ) -> float:
         """
-        Estimate TSS for strength training.
+        Estimate TSS for strength training, rounded for display.
         
-        Strength training has different energy system demands.
-        Uses a modified formula with lower base values.
+        See strength_tss() for the formula.
         """
-        if duration_min <= 0:
-            return 0.0
-        
-        # Normalize RPE
-        rpe = max(1, min(10, rpe))
-        
-        # Strength training typically has lower TSS per minute
-        # due to rest periods and anaerobic nature
-        intensity = rpe / 10
-        
-        # Reduced multiplier compared to cardio
-        return round(duration_min * (intensity ** 2) * 6, 1)
+        return round(strength_tss(duration_min, rpe), 1)
     
     def _detect_rpe_spikes(
         self,
-        intervals: List[IntervalData],
+        arrays: IntervalArrays,
         threshold: float = 2.0
     ) -> List[Dict[str, Any]]:
         """
         Detect sudden RPE increases.
         
         Args:
-            intervals: List of intervals
+            arrays: Interval columns
             threshold: RPE increase threshold to count as spike
             
         Returns:
@@ -201,17 +213,21 @@ class StrengthStrategy(ActivityStrategy):
         """
         events = []
         
-        rpe_intervals = [(i, i.rpe) for i in intervals if i.rpe is not None]
+        rpe_rows = arrays.where_present("rpe")
         
-        if len(rpe_intervals) < 2:
+        if len(rpe_rows) < 2:
             return events
         
-        cumulative_time = 0
-        prev_rpe = rpe_intervals[0][1]
+        rpes, durations = rpe_rows.rpe, rpe_rows.durations
         
-        for interval, rpe in rpe_intervals[1:]:
-            cumulative_time += interval.duration_seconds
-            
+        # Compare each set with the previous one; event times sum the
+        # durations from the second set on
+        for cumulative_time, index, prev_rpe, rpe in zip(
+            accumulate(durations[1:]),
+            rpe_rows.index[1:],
+            rpes,
+            rpes[1:],
+        ):
             rpe_increase = rpe - prev_rpe
             
             if rpe_increase >= threshold:
@@ -221,10 +237,8 @@ class StrengthStrategy(ActivityStrategy):
                     "rpe_before": prev_rpe,
                     "rpe_after": rpe,
                     "increase": round(rpe_increase, 1),
-                    "interval_index": interval.index,
+                    "interval_index": index,
                 })
-            
-            prev_rpe = rpe
         
         return events
 
@@ -2,8 +2,11 @@
 Embedding Service - Generate vector embeddings for text content.
 Supports OpenAI and compatible embedding APIs.
 """
+import hashlib
+import math
 import httpx
-from typing import List
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 from app.core.config import settings
 from app.core.logging import get_logger
@@ -25,10 +28,83 @@ EMBEDDING_CONFIG = {
 }
 
 
+# Process-wide LRU of embedding vectors keyed by sha256(model + text).
+# Plan and week summaries are deterministic from plan data, so re-storing
+# an unchanged plan (and repeated search queries) hit the cache instead
+# of the embedding API. Vectors are stored as tuples and handed out as
+# fresh lists, so a caller mutating its result cannot corrupt the cache.
+_EMBEDDING_CACHE_SIZE = 2048
+_embedding_cache: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+
+
+def _cache_key(model: str, text: str) -> str:
+    """Build the cache key for a text embedded with a given model."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _l2_normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length (zero vectors are returned as-is)."""
+    norm = math.sqrt(math.fsum(x * x for x in vector))
+    if norm == 0:
+        return vector
+    return [x / norm for x in vector]
+
+
+def _cache_get(key: str) -> Optional[List[float]]:
+    """Get a copy of a cached embedding, marking it most recently used."""
+    embedding = _embedding_cache.get(key)
+    if embedding is None:
+        return None
+    _embedding_cache.move_to_end(key)
+    return list(embedding)
+
+
+def _cache_put(key: str, embedding: List[float]) -> None:
+    """Cache an embedding, evicting the least recently used beyond capacity."""
+    _embedding_cache[key] = tuple(embedding)
+    _embedding_cache.move_to_end(key)
+    if len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+
+
+# Shared HTTP client so embedding calls reuse pooled keep-alive
+# connections instead of a new TCP/TLS handshake per request
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared embedding HTTP client."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared embedding HTTP client (call on shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class EmbeddingService:
-    """Service for generating text embeddings."""
+    """
+    Service for generating text embeddings.
+    
+    Embeddings are served from an in-process LRU cache when the same
+    text has already been embedded with the same model.
+    """
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
+        """
+        Args:
+            use_cache: Whether to use the in-process embedding cache
+        """
+        self.use_cache = use_cache
         self.provider = settings.AI_PROVIDER.lower()
         config = EMBEDDING_CONFIG.get(self.provider, EMBEDDING_CONFIG["openai"])
         
@@ -45,7 +121,7 @@ class EmbeddingService:
             text: Text content to embed
             
         Returns:
-            List of floats representing the embedding vector
+            List of floats representing the (unit-length) embedding vector
         """
         return (await self.generate_embeddings([text]))[0]
     
@@ -57,48 +133,85 @@ class EmbeddingService:
             texts: List of text contents to embed
             
         Returns:
-            List of embedding vectors
+            List of unit-length embedding vectors
         """
         if not texts:
             return []
         
+        if not self.use_cache:
+            return await self._request_embeddings(texts)
+        
+        keys = [_cache_key(self.model, text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [_cache_get(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        
+        if missing:
+            fetched = await self._request_embeddings([texts[i] for i in missing])
+            if len(fetched) != len(missing):
+                raise Exception(
+                    f"Embedding count mismatch: expected {len(missing)}, got {len(fetched)}"
+                )
+            for i, embedding in zip(missing, fetched):
+                embeddings[i] = embedding
+                _cache_put(keys[i], embedding)
+        
+        logger.debug(
+            "Resolved embeddings",
+            count=len(texts),
+            cache_hits=len(texts) - len(missing)
+        )
+        
+        return embeddings
+    
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Call the embedding API for texts (no caching).
+        
+        Args:
+            texts: Non-empty list of text contents to embed
+            
+        Returns:
+            List of unit-length embedding vectors
+        """
         endpoint = f"{self.base_url}/embeddings"
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    endpoint,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {self.api_key}",
-                    },
-                    json={
-                        "model": self.model,
-                        "input": texts,
-                    },
-                )
-                
-                if response.status_code != 200:
-                    error_data = response.json() if response.content else {}
-                    error_msg = error_data.get("error", {}).get("message", str(response.status_code))
-                    logger.error(
-                        "Embedding API error",
-                        status_code=response.status_code,
-                        error=error_msg
-                    )
-                    raise Exception(f"Embedding API Error: {response.status_code} - {error_msg}")
-                
-                data = response.json()
-                embeddings = [item["embedding"] for item in data.get("data", [])]
-                
-                logger.debug(
-                    "Generated embeddings",
-                    count=len(embeddings),
-                    model=self.model
+            client = _get_http_client()
+            response = await client.post(
+                endpoint,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {self.api_key}",
+                },
+                json={
+                    "model": self.model,
+                    "input": texts,
+                },
+            )
+            
+            if response.status_code != 200:
+                error_data = response.json() if response.content else {}
+                error_msg = error_data.get("error", {}).get("message", str(response.status_code))
+                logger.error(
+                    "Embedding API error",
+                    status_code=response.status_code,
+                    error=error_msg
                 )
-                
-                return embeddings
-                
+                raise Exception(f"Embedding API Error: {response.status_code} - {error_msg}")
+            
+            data = response.json()
+            # Stored and query vectors are unit-length so similarity search
+            # can use inner product instead of cosine distance
+            embeddings = [_l2_normalize(item["embedding"]) for item in data.get("data", [])]
+            
+            logger.debug(
+                "Generated embeddings",
+                count=len(embeddings),
+                model=self.model
+            )
+            
+            return embeddings
+            
         except httpx.TimeoutException:
             logger.error("Embedding request timed out")
             raise Exception("Embedding request timed out")
@@ -2,7 +2,6 @@
 Context Manager - High-level context management for AI agents.
 Handles storage, retrieval, and assembly of contextual information.
 """
-import json
 import uuid
 from typing import Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,6 +12,107 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Display labels for content types
+_TYPE_LABELS = {
+    ContentType.PLAN: "训练计划",
+    ContentType.ANALYSIS: "训练分析",
+    ContentType.HISTORY: "对话记录",
+}
+
+# Plan/week summary templates used for embedding text. Long-term memory
+# embeds plans with the same templates.
+_PLAN_SUMMARY_TEMPLATE = (
+    "训练计划概览\n"
+    "目标: {goal}\n"
+    "运动项目: {item}\n"
+    "训练周期: {weeks} 周\n"
+    "运动水平: {level}"
+)
+_PLAN_WEEK_LINE = "- 第{}周: {}"
+_WEEK_HEADER_TEMPLATE = "第{}周训练计划\n周目标: {}"
+_WEEK_DAY_LINE = "- {}: {} ({}...)"
+
+
+def _plan_context_items(plan_data: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Build the embedding items for a training plan.
+    
+    The overall plan summary plus each week's focus become separate
+    context entries. Callers pass them to replace_plan_content, which
+    keeps unchanged entries from a previous save, so only edited weeks
+    are re-embedded and rewritten.
+    
+    Args:
+        plan_data: Plan data including weeks and user profile
+        
+    Returns:
+        Items with content_text and metadata, plan summary first
+    """
+    weeks = plan_data.get("weeks", [])
+    user_profile = plan_data.get("userProfile", {})
+    
+    items = [{
+        "content_text": _create_plan_summary(user_profile, weeks),
+        "metadata": {
+            "type": "plan_summary",
+            "totalWeeks": len(weeks),
+            "goal": user_profile.get("goal", ""),
+        },
+    }]
+    items.extend(
+        {
+            "content_text": _create_week_summary(week),
+            "metadata": {
+                "type": "week_detail",
+                "weekNumber": week.get("weekNumber"),
+            },
+        }
+        for week in weeks
+    )
+    return items
+
+
+def _create_plan_summary(
+    user_profile: dict[str, Any],
+    weeks: list[dict[str, Any]]
+) -> str:
+    """Create a text summary of the training plan."""
+    summary = _PLAN_SUMMARY_TEMPLATE.format(
+        goal=user_profile.get("goal", "未指定"),
+        item=user_profile.get("item", "未指定"),
+        weeks=len(weeks),
+        level=user_profile.get("level", "未指定"),
+    )
+    
+    if weeks:
+        summary += "\n\n每周重点:\n" + "\n".join(
+            _PLAN_WEEK_LINE.format(week.get("weekNumber", "?"), week.get("summary", ""))
+            for week in weeks
+        )
+    
+    return summary
+
+
+def _create_week_summary(week: dict[str, Any]) -> str:
+    """Create a text summary of a training week."""
+    summary = _WEEK_HEADER_TEMPLATE.format(
+        week.get("weekNumber", "?"),
+        week.get("summary", ""),
+    )
+    
+    days = week.get("days", [])
+    if days:
+        summary += "\n\n训练安排:\n" + "\n".join(
+            _WEEK_DAY_LINE.format(
+                day.get("day", ""),
+                day.get("focus", ""),
+                ", ".join(e.get("name", "") for e in day.get("exercises", [])[:3]),
+            )
+            for day in days
+        )
+    
+    return summary
+
 
 class ContextManager:
     """High-level context management for AI agents."""
@@ -34,41 +134,9 @@ class ContextManager:
             plan_id: Plan UUID
             plan_data: Plan data including weeks and user profile
         """
-        # Delete existing plan embeddings first
-        await self.vector_store.delete_by_plan(
-            plan_id, 
-            content_types=[ContentType.PLAN]
-        )
-        
-        # Create summary text from plan
         weeks = plan_data.get("weeks", [])
-        user_profile = plan_data.get("userProfile", {})
-        
-        # Store overall plan summary
-        plan_summary = self._create_plan_summary(plan_data)
-        await self.vector_store.store(
-            content_text=plan_summary,
-            content_type=ContentType.PLAN,
-            plan_id=plan_id,
-            metadata={
-                "type": "plan_summary",
-                "totalWeeks": len(weeks),
-                "goal": user_profile.get("goal", ""),
-            }
-        )
-        
-        # Store each week's focus as separate context
-        for week in weeks:
-            week_text = self._create_week_summary(week)
-            await self.vector_store.store(
-                content_text=week_text,
-                content_type=ContentType.PLAN,
-                plan_id=plan_id,
-                metadata={
-                    "type": "week_detail",
-                    "weekNumber": week.get("weekNumber"),
-                }
-            )
+        items = _plan_context_items(plan_data)
+        await self.vector_store.replace_plan_content(plan_id, ContentType.PLAN, items)
         
         logger.info(
             "Stored plan context",
@@ -145,7 +213,8 @@ class ContextManager:
         query: str,
         plan_id: Optional[uuid.UUID] = None,
         content_types: Optional[List[str]] = None,
-        limit: int = 5
+        limit: int = 5,
+        per_type_limit: Optional[int] = None
     ) -> str:
         """
         Retrieve relevant context for a query.
@@ -154,7 +223,10 @@ class ContextManager:
             query: Query text to find relevant context
             plan_id: Filter by plan ID
             content_types: Filter by content types
-            limit: Maximum number of context items
+            limit: Maximum number of context items (global top-k)
+            per_type_limit: If set, return up to this many items per
+                content type instead of a global top-k (one embedding
+                call and one query for all types)
             
         Returns:
             Formatted context string for AI prompt injection
@@ -162,12 +234,23 @@ class ContextManager:
         if content_types is None:
             content_types = [ContentType.PLAN, ContentType.ANALYSIS, ContentType.HISTORY]
         
-        records = await self.vector_store.search(
-            query=query,
-            plan_id=plan_id,
-            content_types=content_types,
-            limit=limit
-        )
+        # Nothing can match: skip the embedding call and the query
+        if not content_types or (per_type_limit if per_type_limit is not None else limit) <= 0:
+            return ""
+        
+        if per_type_limit is not None:
+            records = await self.vector_store.search_per_type(
+                query=query,
+                per_type_limits={t: per_type_limit for t in content_types},
+                plan_id=plan_id
+            )
+        else:
+            records = await self.vector_store.search(
+                query=query,
+                plan_id=plan_id,
+                content_types=content_types,
+                limit=limit
+            )
         
         if not records:
             return ""
@@ -197,56 +280,12 @@ class ContextManager:
         """
         records = await self.vector_store.get_by_plan(
             plan_id=plan_id,
-            content_types=[ContentType.HISTORY]
+            content_types=[ContentType.HISTORY],
+            limit=limit
         )
         
-        return [r.content_text for r in records[:limit]]
-    
-    def _create_plan_summary(self, plan_data: dict[str, Any]) -> str:
-        """Create a text summary of the training plan."""
-        user_profile = plan_data.get("userProfile", {})
-        weeks = plan_data.get("weeks", [])
-        
-        parts = [
-            f"训练计划概览",
-            f"目标: {user_profile.get('goal', '未指定')}",
-            f"运动项目: {user_profile.get('item', '未指定')}",
-            f"训练周期: {len(weeks)} 周",
-            f"运动水平: {user_profile.get('level', '未指定')}",
-        ]
-        
-        if weeks:
-            parts.append("\n每周重点:")
-            for week in weeks:
-                parts.append(f"- 第{week.get('weekNumber', '?')}周: {week.get('summary', '')}")
-        
-        return "\n".join(parts)
-    
-    def _create_week_summary(self, week: dict[str, Any]) -> str:
-        """Create a text summary of a training week."""
-        parts = [
-            f"第{week.get('weekNumber', '?')}周训练计划",
-            f"周目标: {week.get('summary', '')}",
-        ]
-        
-        days = week.get("days", [])
-        if days:
-            parts.append("\n训练安排:")
-            for day in days:
-                day_name = day.get("day", "")
-                focus = day.get("focus", "")
-                exercises = day.get("exercises", [])
-                exercise_names = [e.get("name", "") for e in exercises]
-                parts.append(f"- {day_name}: {focus} ({', '.join(exercise_names[:3])}...)")
-        
-        return "\n".join(parts)
+        return [r.content_text for r in records]
     
     def _get_type_label(self, content_type: str) -> str:
         """Get display label for content type."""
-        labels = {
-            ContentType.PLAN: "训练计划",
-            ContentType.ANALYSIS: "训练分析",
-            ContentType.HISTORY: "对话记录",
-        }
-        return labels.get(content_type, content_type)
-
+        return _TYPE_LABELS.get(content_type, content_type)
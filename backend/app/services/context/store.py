@@ -2,16 +2,34 @@
 Vector Store - Storage and retrieval of vector embeddings using pgvector.
 """
 import uuid
-from typing import List, Optional
-from sqlalchemy import select, delete
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, delete, text, cast, literal, func, and_, or_, union_all
+from sqlalchemy.orm import defer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.context import ContextEmbedding, ContentType
+from pgvector.sqlalchemy import Vector
+
+from app.models.context import (
+    ContextEmbedding,
+    ContentType,
+    EMBEDDING_DIMENSIONS,
+    HalfVector,
+)
 from app.services.context.embedding import EmbeddingService
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# HNSW candidate list size per search. Filters (plan, content type) are
+# applied after the index scan, so filtered searches over-fetch to still
+# return up to `limit` rows.
+_EF_SEARCH = 40
+_FILTERED_OVERFETCH = 10
+
+# The ANN index ranks half-precision vectors; this many candidates per
+# requested result are reranked on the full-precision embedding.
+_RERANK_OVERFETCH = 4
+
 
 class VectorStore:
     """Vector storage and retrieval using pgvector."""
@@ -39,28 +57,150 @@ class VectorStore:
         Returns:
             Created ContextEmbedding record
         """
-        embedding = await self.embedding_service.generate_embedding(content_text)
+        records = await self.store_many([{
+            "content_text": content_text,
+            "content_type": content_type,
+            "plan_id": plan_id,
+            "metadata": metadata,
+        }])
+        return records[0]
+    
+    async def store_many(self, items: List[Dict[str, Any]]) -> List[ContextEmbedding]:
+        """
+        Store several text contents with one embedding call and one flush.
         
-        record = ContextEmbedding(
-            plan_id=plan_id,
-            content_type=content_type,
-            content_text=content_text,
-            embedding=embedding,
-            extra_metadata=metadata or {}
+        Args:
+            items: Dicts with content_text, content_type and optional
+                plan_id and metadata keys (same meaning as in store())
+            
+        Returns:
+            Created ContextEmbedding records, in input order
+        """
+        if not items:
+            return []
+        
+        embeddings = await self.embedding_service.generate_embeddings(
+            [item["content_text"] for item in items]
         )
         
-        self.db.add(record)
+        if len(embeddings) != len(items):
+            raise Exception(
+                f"Embedding count mismatch: expected {len(items)}, got {len(embeddings)}"
+            )
+        
+        records = [
+            ContextEmbedding(
+                plan_id=item.get("plan_id"),
+                content_type=item["content_type"],
+                content_text=item["content_text"],
+                embedding=embedding,
+                extra_metadata=item.get("metadata") or {}
+            )
+            for item, embedding in zip(items, embeddings)
+        ]
+        
+        self.db.add_all(records)
         await self.db.flush()
-        await self.db.refresh(record)
         
         logger.debug(
-            "Stored embedding",
-            id=str(record.id),
-            content_type=content_type,
-            plan_id=str(plan_id) if plan_id else None
+            "Stored embeddings",
+            count=len(records)
         )
         
-        return record
+        return records
+    
+    async def replace_plan_content(
+        self,
+        plan_id: uuid.UUID,
+        content_type: str,
+        items: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Replace a plan's content of one type, rewriting only what changed.
+        
+        Existing rows are matched to items by (metadata type, weekNumber).
+        Rows whose text is unchanged are kept as-is, changed rows are
+        updated in place, new items are inserted and unmatched rows are
+        deleted. Only new or changed texts are embedded, so re-saving a
+        plan with a small edit re-embeds just the edited weeks.
+        
+        Args:
+            plan_id: Plan ID the content belongs to
+            content_type: Type of content being replaced
+            items: Dicts with content_text and metadata keys
+        """
+        stmt = select(ContextEmbedding).options(
+            defer(ContextEmbedding.embedding)
+        ).where(
+            ContextEmbedding.plan_id == plan_id,
+            ContextEmbedding.content_type == content_type
+        )
+        result = await self.db.execute(stmt)
+        
+        def item_key(metadata: Optional[dict]) -> tuple:
+            metadata = metadata or {}
+            return (metadata.get("type"), metadata.get("weekNumber"))
+        
+        existing: Dict[tuple, ContextEmbedding] = {}
+        stale: List[uuid.UUID] = []
+        for record in result.scalars().all():
+            key = item_key(record.extra_metadata)
+            if key in existing:
+                stale.append(record.id)
+            else:
+                existing[key] = record
+        
+        changed: List[Tuple[Optional[ContextEmbedding], Dict[str, Any]]] = []
+        for item in items:
+            metadata = item.get("metadata") or {}
+            record = existing.pop(item_key(metadata), None)
+            
+            if record is None or record.content_text != item["content_text"]:
+                changed.append((record, item))
+            elif record.extra_metadata != metadata:
+                record.extra_metadata = metadata
+        
+        stale.extend(record.id for record in existing.values())
+        
+        if changed:
+            embeddings = await self.embedding_service.generate_embeddings(
+                [item["content_text"] for _, item in changed]
+            )
+            
+            if len(embeddings) != len(changed):
+                raise Exception(
+                    f"Embedding count mismatch: expected {len(changed)}, got {len(embeddings)}"
+                )
+            
+            for (record, item), embedding in zip(changed, embeddings):
+                if record is None:
+                    self.db.add(ContextEmbedding(
+                        plan_id=plan_id,
+                        content_type=content_type,
+                        content_text=item["content_text"],
+                        embedding=embedding,
+                        extra_metadata=item.get("metadata") or {}
+                    ))
+                else:
+                    record.content_text = item["content_text"]
+                    record.embedding = embedding
+                    record.extra_metadata = item.get("metadata") or {}
+        
+        if stale:
+            await self.db.execute(
+                delete(ContextEmbedding).where(ContextEmbedding.id.in_(stale))
+            )
+        
+        await self.db.flush()
+        
+        logger.debug(
+            "Replaced plan content",
+            plan_id=str(plan_id),
+            content_type=content_type,
+            changed=len(changed),
+            unchanged=len(items) - len(changed),
+            deleted=len(stale)
+        )
     
     async def search(
         self,
@@ -79,22 +219,45 @@ class VectorStore:
             limit: Maximum number of results
             
         Returns:
-            List of matching ContextEmbedding records
+            List of matching ContextEmbedding records (embedding not loaded)
         """
+        # An empty type filter or zero limit can't match anything
+        if limit <= 0 or content_types == []:
+            return []
+        
+        # A plan with no matching rows (e.g. new plan, no history yet)
+        # can't produce results: skip the embedding API call entirely
+        if plan_id is not None and not await self._has_rows(plan_id, content_types):
+            return []
+        
         query_embedding = await self.embedding_service.generate_embedding(query)
         
-        # Build query with filters
-        stmt = select(ContextEmbedding)
+        candidate_count = limit * _RERANK_OVERFETCH
+        ef_search = max(_EF_SEARCH, candidate_count)
+        if plan_id or content_types:
+            ef_search = max(ef_search, limit * _FILTERED_OVERFETCH)
+        await self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        
+        # Stage 1: coarse candidates from the half-precision HNSW index
+        half_distance = self._half_distance(query_embedding)
+        candidates = select(ContextEmbedding.id)
         
         if plan_id:
-            stmt = stmt.where(ContextEmbedding.plan_id == plan_id)
+            candidates = candidates.where(ContextEmbedding.plan_id == plan_id)
         
         if content_types:
-            stmt = stmt.where(ContextEmbedding.content_type.in_(content_types))
+            candidates = candidates.where(ContextEmbedding.content_type.in_(content_types))
         
-        # Order by cosine similarity (using pgvector's <=> operator)
-        stmt = stmt.order_by(
-            ContextEmbedding.embedding.cosine_distance(query_embedding)
+        candidates = candidates.order_by(half_distance).limit(candidate_count).subquery()
+        
+        # Stage 2: rerank the candidates on the full-precision vectors. The
+        # vector is only needed for ordering, so it isn't loaded.
+        stmt = select(ContextEmbedding).options(
+            defer(ContextEmbedding.embedding, raiseload=True)
+        ).join(
+            candidates, ContextEmbedding.id == candidates.c.id
+        ).order_by(
+            ContextEmbedding.embedding.max_inner_product(query_embedding)
         ).limit(limit)
         
         result = await self.db.execute(stmt)
@@ -109,28 +272,163 @@ class VectorStore:
         
         return list(records)
     
-    async def get_by_plan(
+    async def search_per_type(
+        self,
+        query: str,
+        per_type_limits: Dict[str, int],
+        plan_id: Optional[uuid.UUID] = None
+    ) -> List[ContextEmbedding]:
+        """
+        Search for the most similar content within each content type.
+        
+        Embeds the query once and runs a single statement: a LIMITed
+        half-precision index scan per type (UNION ALL), reranked per type
+        on the full-precision vectors. This replaces one search() call,
+        and embedding request, per type.
+        
+        Args:
+            query: Query text to search for
+            per_type_limits: Maximum results per content type,
+                e.g. {"plan": 2, "analysis": 2, "history": 2}
+            plan_id: Filter by plan ID
+            
+        Returns:
+            Matching ContextEmbedding records across all types, most
+            similar first (embedding not loaded)
+        """
+        content_types = [t for t, n in per_type_limits.items() if n > 0]
+        
+        if not content_types:
+            return []
+        
+        if plan_id is not None and not await self._has_rows(plan_id, content_types):
+            return []
+        
+        query_embedding = await self.embedding_service.generate_embedding(query)
+        
+        # Each type's scan is filtered on content type, so it over-fetches
+        # like a filtered search()
+        largest_limit = max(per_type_limits[t] for t in content_types)
+        ef_search = max(_EF_SEARCH, largest_limit * _FILTERED_OVERFETCH)
+        await self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        
+        # Stage 1: one LIMITed half-precision index scan per type
+        half_distance = self._half_distance(query_embedding)
+        per_type = []
+        for content_type in content_types:
+            type_candidates = select(
+                ContextEmbedding.id,
+                ContextEmbedding.content_type
+            ).where(ContextEmbedding.content_type == content_type)
+            
+            if plan_id:
+                type_candidates = type_candidates.where(ContextEmbedding.plan_id == plan_id)
+            
+            per_type.append(
+                type_candidates.order_by(half_distance).limit(
+                    per_type_limits[content_type] * _RERANK_OVERFETCH
+                )
+            )
+        candidates = union_all(*per_type).subquery()
+        
+        # Stage 2: rerank each type's candidates on the full-precision
+        # vectors; the window only spans the small candidate set
+        distance = ContextEmbedding.embedding.max_inner_product(query_embedding)
+        ranked = select(
+            candidates.c.id,
+            candidates.c.content_type,
+            distance.label("distance"),
+            func.row_number().over(
+                partition_by=candidates.c.content_type,
+                order_by=distance
+            ).label("type_rank")
+        ).join_from(
+            candidates, ContextEmbedding, ContextEmbedding.id == candidates.c.id
+        ).subquery()
+        
+        stmt = select(ContextEmbedding).options(
+            defer(ContextEmbedding.embedding, raiseload=True)
+        ).join(
+            ranked, ContextEmbedding.id == ranked.c.id
+        ).where(
+            or_(*(
+                and_(ranked.c.content_type == content_type, ranked.c.type_rank <= per_type_limits[content_type])
+                for content_type in content_types
+            ))
+        ).order_by(ranked.c.distance)
+        
+        result = await self.db.execute(stmt)
+        records = result.scalars().all()
+        
+        logger.debug(
+            "Per-type vector search completed",
+            query_length=len(query),
+            results_count=len(records),
+            plan_id=str(plan_id) if plan_id else None
+        )
+        
+        return list(records)
+    
+    def _half_distance(self, query_embedding: List[float]):
+        """
+        Half-precision distance expression matching the HNSW index.
+        
+        Vectors are unit-length, so the negative inner product (<#>,
+        matching the index's halfvec_ip_ops) ranks like cosine distance.
+        """
+        half_type = HalfVector(EMBEDDING_DIMENSIONS)
+        return cast(ContextEmbedding.embedding, half_type).op("<#>")(
+            cast(literal(query_embedding, Vector(EMBEDDING_DIMENSIONS)), half_type)
+        )
+    
+    async def _has_rows(
         self,
         plan_id: uuid.UUID,
         content_types: Optional[List[str]] = None
+    ) -> bool:
+        """Check whether a plan has any rows of the given content types."""
+        stmt = select(ContextEmbedding.id).where(
+            ContextEmbedding.plan_id == plan_id
+        )
+        if content_types:
+            stmt = stmt.where(ContextEmbedding.content_type.in_(content_types))
+        
+        result = await self.db.execute(stmt.limit(1))
+        return result.first() is not None
+    
+    async def get_by_plan(
+        self,
+        plan_id: uuid.UUID,
+        content_types: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[ContextEmbedding]:
         """
-        Get all embeddings for a specific plan.
+        Get embeddings for a specific plan, newest first.
         
         Args:
             plan_id: Plan ID to filter by
             content_types: Filter by content types
+            limit: Maximum number of records (None for all)
+            offset: Number of newest records to skip, for paging
             
         Returns:
-            List of ContextEmbedding records
+            List of ContextEmbedding records (embedding not loaded)
         """
-        stmt = select(ContextEmbedding).where(
+        stmt = select(ContextEmbedding).options(
+            defer(ContextEmbedding.embedding, raiseload=True)
+        ).where(
             ContextEmbedding.plan_id == plan_id
         ).order_by(ContextEmbedding.created_at.desc())
         
         if content_types:
             stmt = stmt.where(ContextEmbedding.content_type.in_(content_types))
         
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
     
@@ -0,0 +1,13 @@
+"""
+Shared helpers for the placeholder external platform integrations.
+"""
+
+NOT_IMPLEMENTED_TEMPLATE = (
+    "{feature} is not yet implemented. "
+    "This feature will be available in a future version."
+)
+
+
+def not_implemented(feature: str) -> NotImplementedError:
+    """Build the NotImplementedError raised by placeholder methods."""
+    return NotImplementedError(NOT_IMPLEMENTED_TEMPLATE.format(feature=feature))
@@ -4,14 +4,51 @@ Export Service - Export training plans to various formats.
 Currently supports:
 - iCal (.ics) calendar format
 """
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from typing import Any, Dict, List, Optional
-from io import StringIO
 
-from app.core.logging import get_logger
+from app.core.logging import get_logger, is_debug_enabled
 
 logger = get_logger(__name__)
 
+# Fixed calendar lines around the X-WR-CALNAME header, and the footer
+_ICAL_HEADER_PREFIX = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//MyCoach//Training Plan//CN\r\n"
+)
+_ICAL_HEADER_SUFFIX = (
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:PUBLISH\r\n"
+)
+_ICAL_FOOTER = "END:VCALENDAR\r\n"
+
+# Fixed lines closing every iCal event
+_ICAL_EVENT_TAIL = (
+    "\r\n"
+    "STATUS:CONFIRMED\r\n"
+    "TRANSP:TRANSPARENT\r\n"
+    "END:VEVENT\r\n"
+)
+
+# Day name (周X / 星期X) to offset from week start (Monday)
+_DAY_OFFSETS = {
+    "周一": 0,
+    "周二": 1,
+    "周三": 2,
+    "周四": 3,
+    "周五": 4,
+    "周六": 5,
+    "周日": 6,
+    "星期一": 0,
+    "星期二": 1,
+    "星期三": 2,
+    "星期四": 3,
+    "星期五": 4,
+    "星期六": 5,
+    "星期日": 6,
+}
+
 
 class ExportService:
     """
@@ -19,7 +56,8 @@ class ExportService:
     """
     
     def __init__(self):
-        logger.info("ExportService initialized")
+        if is_debug_enabled(__name__):
+            logger.debug("ExportService initialized")
     
     def export_to_ical(
         self,
@@ -38,44 +76,46 @@ class ExportService:
         Returns:
             iCal formatted string
         """
-        output = StringIO()
-        
-        # iCal header
-        output.write("BEGIN:VCALENDAR\r\n")
-        output.write("VERSION:2.0\r\n")
-        output.write("PRODID:-//MyCoach//Training Plan//CN\r\n")
-        output.write(f"X-WR-CALNAME:{calendar_name}\r\n")
-        output.write("CALSCALE:GREGORIAN\r\n")
-        output.write("METHOD:PUBLISH\r\n")
+        # Fragments are collected in a list and joined once at the end
+        parts: List[str] = [
+            _ICAL_HEADER_PREFIX,
+            f"X-WR-CALNAME:{calendar_name}\r\n",
+            _ICAL_HEADER_SUFFIX,
+        ]
+        
+        # All events in one export share the same creation timestamp
+        dtstamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         
         weeks = plan_data.get("weeks", [])
         
+        start_ordinal = start_date.toordinal()
+        append_event = self._append_ical_event
+        
         for week in weeks:
+            # Resolve day offsets up front, dropping unrecognized day names
+            scheduled_days = [
+                (day_offset, day_data)
+                for day_data in week.get("days", [])
+                if (day_offset := _DAY_OFFSETS.get(day_data.get("day", ""))) is not None
+            ]
+            if not scheduled_days:
+                continue
+            
             week_number = week.get("weekNumber", 1)
-            week_start = start_date + timedelta(weeks=week_number - 1)
+            week_start_ordinal = start_ordinal + (week_number - 1) * 7
             
-            for day_data in week.get("days", []):
-                day_name = day_data.get("day", "")
-                day_offset = self._get_day_offset(day_name)
-                
-                if day_offset is None:
-                    continue
-                
-                event_date = week_start + timedelta(days=day_offset)
-                
-                # Create event
-                event = self._create_ical_event(
+            for day_offset, day_data in scheduled_days:
+                append_event(
+                    parts,
                     day_data,
-                    event_date,
-                    week_number
+                    date.fromordinal(week_start_ordinal + day_offset),
+                    week_number,
+                    dtstamp
                 )
-                output.write(event)
         
-        # iCal footer
-        output.write("END:VCALENDAR\r\n")
+        parts.append(_ICAL_FOOTER)
         
-        result = output.getvalue()
-        output.close()
+        result = "".join(parts)
         
         logger.info(
             "Exported plan to iCal",
@@ -85,13 +125,15 @@ class ExportService:
         
         return result
     
-    def _create_ical_event(
+    def _append_ical_event(
         self,
+        parts: List[str],
         day_data: Dict[str, Any],
         event_date: date,
-        week_number: int
-    ) -> str:
-        """Create a single iCal event."""
+        week_number: int,
+        dtstamp: str
+    ) -> None:
+        """Append the lines of a single iCal event to parts."""
         focus = day_data.get("focus", "训练")
         day_name = day_data.get("day", "")
         exercises = day_data.get("exercises", [])
@@ -99,77 +141,43 @@ class ExportService:
         # Generate unique ID
         uid = f"{event_date.isoformat()}-{day_name}@mycoach"
         
-        # Build description
-        description_parts = [f"第{week_number}周 - {focus}"]
+        # Build description lines, joined with an escaped iCal newline
+        description_lines = [f"第{week_number}周 - {focus}"]
         
         if exercises:
-            description_parts.append("\\n\\n训练内容:")
+            description_lines.append("")
+            description_lines.append("训练内容:")
             for i, exercise in enumerate(exercises, 1):
-                name = exercise.get("name", "")
-                sets = exercise.get("sets", "")
-                reps = exercise.get("reps", "")
-                notes = exercise.get("notes", "")
+                get = exercise.get
+                name = get("name", "")
+                sets = get("sets", "")
+                reps = get("reps", "")
+                notes = get("notes", "")
                 
-                line = f"\\n{i}. {name}"
-                if sets and reps:
-                    line += f" - {sets}组 x {reps}"
-                if notes:
-                    line += f" ({notes})"
+                sets_reps = f" - {sets}组 x {reps}" if sets and reps else ""
+                notes_text = f" ({notes})" if notes else ""
                 
-                description_parts.append(line)
+                description_lines.append(f"{i}. {name}{sets_reps}{notes_text}")
         
-        description = "".join(description_parts)
+        description = "\\n".join(description_lines)
         
         # Event title
         summary = f"🏋️ {focus}"
         
         # Format dates for iCal (all-day event)
-        date_str = event_date.strftime("%Y%m%d")
-        next_date = (event_date + timedelta(days=1)).strftime("%Y%m%d")
-        dtstamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        
-        event = (
-            "BEGIN:VEVENT\r\n"
-            f"UID:{uid}\r\n"
-            f"DTSTAMP:{dtstamp}\r\n"
-            f"DTSTART;VALUE=DATE:{date_str}\r\n"
-            f"DTEND;VALUE=DATE:{next_date}\r\n"
-            f"SUMMARY:{summary}\r\n"
-            f"DESCRIPTION:{description}\r\n"
-            "STATUS:CONFIRMED\r\n"
-            "TRANSP:TRANSPARENT\r\n"
-            "END:VEVENT\r\n"
-        )
-        
-        return event
-    
-    def _get_day_offset(self, day_name: str) -> Optional[int]:
-        """
-        Get day offset from week start (Monday).
-        
-        Args:
-            day_name: Chinese day name (周一, 周二, etc.)
-            
-        Returns:
-            Offset from Monday (0-6) or None if invalid
-        """
-        day_map = {
-            "周一": 0,
-            "周二": 1,
-            "周三": 2,
-            "周四": 3,
-            "周五": 4,
-            "周六": 5,
-            "周日": 6,
-            "星期一": 0,
-            "星期二": 1,
-            "星期三": 2,
-            "星期四": 3,
-            "星期五": 4,
-            "星期六": 5,
-            "星期日": 6,
-        }
-        return day_map.get(day_name)
+        next_day = date.fromordinal(event_date.toordinal() + 1)
+        date_str = f"{event_date.year:04d}{event_date.month:02d}{event_date.day:02d}"
+        next_date = f"{next_day.year:04d}{next_day.month:02d}{next_day.day:02d}"
+        
+        parts.extend((
+            "BEGIN:VEVENT\r\nUID:", uid,
+            "\r\nDTSTAMP:", dtstamp,
+            "\r\nDTSTART;VALUE=DATE:", date_str,
+            "\r\nDTEND;VALUE=DATE:", next_date,
+            "\r\nSUMMARY:", summary,
+            "\r\nDESCRIPTION:", description,
+            _ICAL_EVENT_TAIL,
+        ))
     
     def get_ical_content_type(self) -> str:
         """Get the content type for iCal files."""
@@ -7,7 +7,8 @@ will be implemented in a future version.
 from typing import Any, Dict, List, Optional
 from abc import ABC, abstractmethod
 
-from app.core.logging import get_logger
+from app.core.logging import get_logger, is_debug_enabled
+from app.services.external.base import not_implemented
 
 logger = get_logger(__name__)
 
@@ -61,7 +62,8 @@ class IntervalsService(IntervalsServiceInterface):
         self.athlete_id = athlete_id
         self.base_url = "https://intervals.icu/api/v1"
         
-        logger.info("IntervalsService initialized (placeholder)")
+        if is_debug_enabled(__name__):
+            logger.debug("IntervalsService initialized (placeholder)")
     
     async def sync_activities(self, athlete_id: str) -> List[Dict[str, Any]]:
         """
@@ -76,10 +78,7 @@ class IntervalsService(IntervalsServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Intervals.icu activity sync is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Intervals.icu activity sync")
     
     async def push_workout(self, athlete_id: str, workout: Dict[str, Any]) -> str:
         """
@@ -95,10 +94,7 @@ class IntervalsService(IntervalsServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Intervals.icu workout push is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Intervals.icu workout push")
     
     async def get_athlete_profile(self, athlete_id: str) -> Dict[str, Any]:
         """
@@ -113,10 +109,7 @@ class IntervalsService(IntervalsServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Intervals.icu athlete profile fetch is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Intervals.icu athlete profile fetch")
     
     async def get_wellness_data(
         self,
@@ -138,10 +131,7 @@ class IntervalsService(IntervalsServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Intervals.icu wellness data fetch is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Intervals.icu wellness data fetch")
     
     def is_configured(self) -> bool:
         """Check if the service is properly configured."""
@@ -7,7 +7,8 @@ will be implemented in a future version.
 from typing import Any, Dict, List, Optional
 from abc import ABC, abstractmethod
 
-from app.core.logging import get_logger
+from app.core.logging import get_logger, is_debug_enabled
+from app.services.external.base import not_implemented
 
 logger = get_logger(__name__)
 
@@ -76,7 +77,8 @@ class StravaService(StravaServiceInterface):
         self.base_url = "https://www.strava.com/api/v3"
         self.auth_url = "https://www.strava.com/oauth"
         
-        logger.info("StravaService initialized (placeholder)")
+        if is_debug_enabled(__name__):
+            logger.debug("StravaService initialized (placeholder)")
     
     async def get_authorization_url(self, redirect_uri: str) -> str:
         """
@@ -91,10 +93,7 @@ class StravaService(StravaServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Strava OAuth is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Strava OAuth")
     
     async def exchange_token(self, code: str) -> Dict[str, Any]:
         """
@@ -109,10 +108,7 @@ class StravaService(StravaServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Strava token exchange is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Strava token exchange")
     
     async def get_athlete(self, access_token: str) -> Dict[str, Any]:
         """
@@ -127,10 +123,7 @@ class StravaService(StravaServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Strava athlete fetch is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Strava athlete fetch")
     
     async def get_activities(
         self,
@@ -154,10 +147,7 @@ class StravaService(StravaServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Strava activities fetch is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Strava activities fetch")
     
     async def get_activity_details(
         self,
@@ -177,10 +167,7 @@ class StravaService(StravaServiceInterface):
         Raises:
             NotImplementedError: Integration not yet implemented
         """
-        raise NotImplementedError(
-            "Strava activity details fetch is not yet implemented. "
-            "This feature will be available in a future version."
-        )
+        raise not_implemented("Strava activity details fetch")
     
     def is_configured(self) -> bool:
         """Check if the service is properly configured."""
@@ -12,6 +12,7 @@ import uuid
 from typing import Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.context.manager import _TYPE_LABELS, _plan_context_items
 from app.services.context.store import VectorStore
 from app.models.context import ContentType
 from app.core.logging import get_logger
@@ -45,40 +46,9 @@ class LongTermMemory:
             plan_id: Plan UUID
             plan_data: Full plan data including weeks
         """
-        # Delete existing plan embeddings first
-        await self.vector_store.delete_by_plan(
-            plan_id,
-            content_types=[ContentType.PLAN]
-        )
-        
         weeks = plan_data.get("weeks", [])
-        user_profile = plan_data.get("userProfile", {})
-        
-        # Store overall plan summary
-        plan_summary = self._create_plan_summary(plan_data)
-        await self.vector_store.store(
-            content_text=plan_summary,
-            content_type=ContentType.PLAN,
-            plan_id=plan_id,
-            metadata={
-                "type": "plan_summary",
-                "totalWeeks": len(weeks),
-                "goal": user_profile.get("goal", ""),
-            }
-        )
-        
-        # Store each week's focus as separate context
-        for week in weeks:
-            week_text = self._create_week_summary(week)
-            await self.vector_store.store(
-                content_text=week_text,
-                content_type=ContentType.PLAN,
-                plan_id=plan_id,
-                metadata={
-                    "type": "week_detail",
-                    "weekNumber": week.get("weekNumber"),
-                }
-            )
+        items = _plan_context_items(plan_data)
+        await self.vector_store.replace_plan_content(plan_id, ContentType.PLAN, items)
         
         logger.info(
             "Stored plan in long-term memory",
@@ -199,56 +169,12 @@ class LongTermMemory:
         """
         records = await self.vector_store.get_by_plan(
             plan_id=plan_id,
-            content_types=[ContentType.HISTORY]
+            content_types=[ContentType.HISTORY],
+            limit=limit
         )
         
-        return [r.content_text for r in records[:limit]]
-    
-    def _create_plan_summary(self, plan_data: dict[str, Any]) -> str:
-        """Create text summary of training plan."""
-        user_profile = plan_data.get("userProfile", {})
-        weeks = plan_data.get("weeks", [])
-        
-        parts = [
-            "训练计划概览",
-            f"目标: {user_profile.get('goal', '未指定')}",
-            f"运动项目: {user_profile.get('item', '未指定')}",
-            f"训练周期: {len(weeks)} 周",
-            f"运动水平: {user_profile.get('level', '未指定')}",
-        ]
-        
-        if weeks:
-            parts.append("\n每周重点:")
-            for week in weeks:
-                parts.append(f"- 第{week.get('weekNumber', '?')}周: {week.get('summary', '')}")
-        
-        return "\n".join(parts)
-    
-    def _create_week_summary(self, week: dict[str, Any]) -> str:
-        """Create text summary of a training week."""
-        parts = [
-            f"第{week.get('weekNumber', '?')}周训练计划",
-            f"周目标: {week.get('summary', '')}",
-        ]
-        
-        days = week.get("days", [])
-        if days:
-            parts.append("\n训练安排:")
-            for day in days:
-                day_name = day.get("day", "")
-                focus = day.get("focus", "")
-                exercises = day.get("exercises", [])
-                exercise_names = [e.get("name", "") for e in exercises]
-                parts.append(f"- {day_name}: {focus} ({', '.join(exercise_names[:3])}...)")
-        
-        return "\n".join(parts)
+        return [r.content_text for r in records]
     
     def _get_type_label(self, content_type: str) -> str:
         """Get display label for content type."""
-        labels = {
-            ContentType.PLAN: "训练计划",
-            ContentType.ANALYSIS: "训练分析",
-            ContentType.HISTORY: "对话记录",
-        }
-        return labels.get(content_type, content_type)
-
+        return _TYPE_LABELS.get(content_type, content_type)
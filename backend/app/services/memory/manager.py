@@ -7,8 +7,9 @@ Coordinates between:
 - PersistentMemory: Database-stored user preferences
 """
 import uuid
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.memory.long_term import LongTermMemory
@@ -19,30 +20,25 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Singleton working memory instance (shared across requests)
-_working_memory: Optional[WorkingMemory] = None
 
+@lru_cache(maxsize=1024)
+def _parse_plan_id(plan_id: str) -> uuid.UUID:
+    """Parse a plan ID string, memoized since plan IDs recur across a session."""
+    return uuid.UUID(plan_id)
 
+
+@lru_cache(maxsize=1)
 def get_working_memory() -> WorkingMemory:
-    """Get or create the global working memory instance."""
-    global _working_memory
-    if _working_memory is None:
-        _working_memory = WorkingMemory(ttl_minutes=60)
-    return _working_memory
+    """Get or create the global working memory instance (shared across requests)."""
+    return WorkingMemory(ttl_minutes=60)
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedContext:
     """Context retrieved from all memory layers."""
     long_term: str = ""
-    working: Dict[str, Any] = None
-    preferences: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.working is None:
-            self.working = {}
-        if self.preferences is None:
-            self.preferences = {}
+    working: Dict[str, Any] = field(default_factory=dict)
+    preferences: Dict[str, Any] = field(default_factory=dict)
     
     def format_for_prompt(self) -> str:
         """Format all context for prompt injection."""
@@ -52,8 +48,7 @@ class RetrievedContext:
             parts.append(self.long_term)
         
         if self.preferences:
-            from app.services.memory.persistent import PersistentMemory
-            pref_str = PersistentMemory(None).format_for_context(self.preferences)
+            pref_str = PersistentMemory.format_for_context(self.preferences)
             if pref_str:
                 parts.append(pref_str)
         
@@ -104,7 +99,7 @@ class MemoryManager:
             try:
                 context.long_term = await self.long_term.search(
                     query=query,
-                    plan_id=uuid.UUID(plan_id),
+                    plan_id=_parse_plan_id(plan_id),
                     limit=5
                 )
             except Exception as e:
@@ -117,7 +112,7 @@ class MemoryManager:
         # Persistent memory (user preferences)
         if include_persistent and plan_id:
             try:
-                context.preferences = await self.persistent.get(uuid.UUID(plan_id))
+                context.preferences = await self.persistent.get(_parse_plan_id(plan_id))
             except Exception as e:
                 logger.warning("Failed to retrieve persistent memory", error=str(e))
         
@@ -139,20 +134,21 @@ class MemoryManager:
         """
         # Long-term memory updates
         if update.long_term and plan_id:
-            plan_uuid = uuid.UUID(plan_id)
+            plan_uuid = _parse_plan_id(plan_id)
             lt = update.long_term
+            lt_type = lt.get("type")
             
-            if lt.get("type") == "plan":
+            if lt_type == "plan":
                 await self.long_term.store_plan(plan_uuid, lt.get("data", {}))
             
-            elif lt.get("type") == "analysis":
+            elif lt_type == "analysis":
                 await self.long_term.store_analysis(
                     plan_uuid,
                     lt.get("text", ""),
                     lt.get("record_data")
                 )
             
-            elif lt.get("type") == "conversation":
+            elif lt_type == "conversation":
                 await self.long_term.store_conversation(
                     plan_uuid,
                     lt.get("user_message", ""),
@@ -165,7 +161,7 @@ class MemoryManager:
         
         # Persistent memory updates
         if update.persistent and plan_id:
-            await self.persistent.upsert(uuid.UUID(plan_id), update.persistent)
+            await self.persistent.upsert(_parse_plan_id(plan_id), update.persistent)
     
     async def store_plan_context(
         self,
@@ -179,7 +175,7 @@ class MemoryManager:
             plan_id: Plan ID
             plan_data: Full plan data
         """
-        await self.long_term.store_plan(uuid.UUID(plan_id), plan_data)
+        await self.long_term.store_plan(_parse_plan_id(plan_id), plan_data)
     
     async def store_conversation(
         self,
@@ -203,7 +199,7 @@ class MemoryManager:
         
         # Long-term memory - semantic retrieval
         await self.long_term.store_conversation(
-            uuid.UUID(plan_id),
+            _parse_plan_id(plan_id),
             user_message,
             assistant_response
         )
@@ -223,7 +219,7 @@ class MemoryManager:
             record_data: Original workout record
         """
         await self.long_term.store_analysis(
-            uuid.UUID(plan_id),
+            _parse_plan_id(plan_id),
             analysis_text,
             record_data
         )
@@ -242,7 +238,7 @@ class MemoryManager:
             insight: Insight text
             category: Insight category
         """
-        await self.persistent.add_insight(uuid.UUID(plan_id), insight, category)
+        await self.persistent.add_insight(_parse_plan_id(plan_id), insight, category)
     
     def get_conversation_history(
         self,
@@ -9,10 +9,16 @@ Stores:
 This data persists across sessions and is used to personalize
 the agent's behavior over time.
 """
+import copy
+import json
+import time
 import uuid
-from typing import Any, Dict, List, Optional
-from sqlalchemy import select, delete
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, select, delete, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
 from sqlalchemy.dialects.postgresql import insert
 
 from app.models.preference import UserPreference
@@ -21,6 +27,166 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 
 
+def _build_upsert_preference():
+    """Build the preference upsert statement (rows are bound at execute time)."""
+    stmt = insert(UserPreference)
+    return stmt.on_conflict_do_update(
+        index_elements=['plan_id', 'preference_key'],
+        set_={
+            'preference_value': stmt.excluded.preference_value,
+            'updated_at': stmt.excluded.updated_at
+        }
+    )
+
+
+# Upsert a preference row. The statement is built once and its SQL is
+# the same for any number of rows, so the driver can reuse the prepared
+# statement across calls.
+_UPSERT_PREFERENCE = _build_upsert_preference()
+
+# Accumulated insights kept per plan (oldest dropped first)
+_MAX_INSIGHTS = 50
+
+# Append insights to the plan's list and trim it to the newest
+# :max_insights entries. A missing or non-list value starts a new list.
+_ADD_INSIGHTS_SQL = text("""
+    INSERT INTO user_preferences
+        (id, plan_id, preference_key, preference_value, created_at, updated_at)
+    VALUES
+        (:id, :plan_id, :key, CAST(:insights AS JSONB), :now, :now)
+    ON CONFLICT (plan_id, preference_key) DO UPDATE SET
+        preference_value = CASE
+            WHEN jsonb_typeof(user_preferences.preference_value) = 'array' THEN (
+                SELECT jsonb_agg(t.elem ORDER BY t.idx)
+                FROM jsonb_array_elements(
+                    user_preferences.preference_value || EXCLUDED.preference_value
+                ) WITH ORDINALITY AS t(elem, idx)
+                WHERE t.idx > jsonb_array_length(user_preferences.preference_value)
+                    + jsonb_array_length(EXCLUDED.preference_value) - :max_insights
+            )
+            ELSE EXCLUDED.preference_value
+        END,
+        updated_at = EXCLUDED.updated_at
+""")
+
+# Add an exercise to the plan's preferred/avoided list, or update its
+# reason if it is already listed (a NULL :reason leaves it unchanged).
+# A missing or non-list value starts a new list.
+_ADD_EXERCISE_PREFERENCE_SQL = text("""
+    INSERT INTO user_preferences
+        (id, plan_id, preference_key, preference_value, created_at, updated_at)
+    VALUES
+        (:id, :plan_id, :key, CAST(:entry AS JSONB), :now, :now)
+    ON CONFLICT (plan_id, preference_key) DO UPDATE SET
+        preference_value = CASE
+            WHEN jsonb_typeof(user_preferences.preference_value) <> 'array'
+                THEN EXCLUDED.preference_value
+            WHEN NOT user_preferences.preference_value @> CAST(:match AS JSONB)
+                THEN user_preferences.preference_value || EXCLUDED.preference_value
+            WHEN CAST(:reason AS TEXT) IS NULL
+                THEN user_preferences.preference_value
+            ELSE (
+                SELECT jsonb_agg(
+                    CASE WHEN t.elem ->> 'name' = :name
+                        THEN jsonb_set(t.elem, '{reason}', to_jsonb(CAST(:reason AS TEXT)))
+                        ELSE t.elem
+                    END
+                    ORDER BY t.idx
+                )
+                FROM jsonb_array_elements(user_preferences.preference_value)
+                    WITH ORDINALITY AS t(elem, idx)
+            )
+        END,
+        updated_at = EXCLUDED.updated_at
+""")
+
+# Process-local LRU cache for get(), keyed by (plan_id, key or "*" for
+# all keys). Entries expire after a TTL and are invalidated when a
+# transaction that wrote them through this process ends.
+_PREFERENCE_CACHE_SIZE = 1024
+_PREFERENCE_CACHE_TTL = 600.0
+# Misses (no row yet) expire sooner, so a key first written by another
+# worker process shows up quickly
+_PREFERENCE_NEGATIVE_TTL = 60.0
+_ALL_KEYS = "*"
+_MISSING = object()
+_preference_cache: "OrderedDict[Tuple[uuid.UUID, str], Tuple[float, Any]]" = OrderedDict()
+# Bumped on every invalidation. Reads only cache their result if no
+# invalidation happened while they ran, so a value read just before a
+# commit is not cached after it.
+_cache_epoch = 0
+# Session.info key holding invalidations to apply when the session's
+# transaction ends
+_PENDING_INVALIDATIONS = "persistent_memory_pending_invalidations"
+
+
+def _cache_get(cache_key: Tuple[uuid.UUID, str]) -> Any:
+    """Get an unexpired cached value (or _MISSING), marking it most recently used."""
+    entry = _preference_cache.get(cache_key)
+    if entry is None:
+        return _MISSING
+    expires_at, value = entry
+    if expires_at <= time.monotonic():
+        del _preference_cache[cache_key]
+        return _MISSING
+    _preference_cache.move_to_end(cache_key)
+    return value
+
+
+def _cache_put(
+    cache_key: Tuple[uuid.UUID, str],
+    value: Any,
+    ttl: float = _PREFERENCE_CACHE_TTL
+) -> None:
+    """Cache a value, evicting the least recently used beyond capacity."""
+    _preference_cache[cache_key] = (time.monotonic() + ttl, value)
+    _preference_cache.move_to_end(cache_key)
+    if len(_preference_cache) > _PREFERENCE_CACHE_SIZE:
+        _preference_cache.popitem(last=False)
+
+
+def _cache_invalidate(plan_id: uuid.UUID, keys: Optional[Iterable[str]] = None) -> None:
+    """Drop cached entries for the given keys (or all keys) of a plan."""
+    global _cache_epoch
+    _cache_epoch += 1
+    if keys is None:
+        stale = [k for k in _preference_cache if k[0] == plan_id]
+    else:
+        stale = [(plan_id, key) for key in keys]
+        stale.append((plan_id, _ALL_KEYS))
+    for cache_key in stale:
+        _preference_cache.pop(cache_key, None)
+
+
+def _apply_pending_invalidations(session: Session, transaction: SessionTransaction) -> None:
+    """Invalidate what a session wrote once its outermost transaction ends."""
+    if transaction.parent is not None:
+        return
+    pending = session.info.get(_PENDING_INVALIDATIONS)
+    while pending:
+        _cache_invalidate(*pending.pop())
+
+
+def _invalidate_after_transaction(
+    db: AsyncSession,
+    plan_id: uuid.UUID,
+    keys: Optional[List[str]] = None
+) -> None:
+    """
+    Invalidate cached entries after the writing transaction ends.
+    
+    Invalidating right after execute would let a concurrent get() cache
+    the pre-commit value again. Rolled-back writes are invalidated too,
+    which is harmless.
+    """
+    sync_session = db.sync_session
+    pending = sync_session.info.get(_PENDING_INVALIDATIONS)
+    if pending is None:
+        pending = sync_session.info[_PENDING_INVALIDATIONS] = []
+        event.listen(sync_session, "after_transaction_end", _apply_pending_invalidations)
+    pending.append((plan_id, keys))
+
+
 # Predefined preference keys
 class PreferenceKey:
     """Standard preference keys."""
@@ -38,12 +204,18 @@ class PersistentMemory:
     Database-backed persistent memory for user preferences.
     
     Stores preferences that should survive across sessions
-    and be used to personalize the agent's behavior.
+    and be used to personalize the agent's behavior. Writes are
+    executed immediately but committed with the caller's session;
+    cached reads are invalidated when that session's transaction ends.
     """
     
     def __init__(self, db: AsyncSession):
         self.db = db
     
+    def _has_pending_writes(self) -> bool:
+        """Whether this session has preference writes not yet committed."""
+        return bool(self.db.sync_session.info.get(_PENDING_INVALIDATIONS))
+    
     async def get(
         self,
         plan_id: uuid.UUID,
@@ -57,8 +229,18 @@ class PersistentMemory:
             key: Specific key to get, or None for all
             
         Returns:
-            Dict of preferences
+            Dict of preferences (a copy; safe to mutate)
         """
+        # A session with uncommitted writes must see them, and must not
+        # cache what may still roll back
+        use_cache = not self._has_pending_writes()
+        cache_key = (plan_id, key or _ALL_KEYS)
+        if use_cache:
+            cached = _cache_get(cache_key)
+            if cached is not _MISSING:
+                return copy.deepcopy(cached)
+        
+        epoch = _cache_epoch
         try:
             stmt = select(UserPreference).where(
                 UserPreference.plan_id == plan_id
@@ -72,12 +254,18 @@ class PersistentMemory:
             
             if key:
                 # Return single value
-                if prefs:
-                    return prefs[0].preference_value
-                return {}
+                value = prefs[0].preference_value if prefs else {}
+            else:
+                # Return all preferences as dict
+                value = {p.preference_key: p.preference_value for p in prefs}
             
-            # Return all preferences as dict
-            return {p.preference_key: p.preference_value for p in prefs}
+            if use_cache and epoch == _cache_epoch:
+                _cache_put(
+                    cache_key,
+                    value,
+                    _PREFERENCE_CACHE_TTL if prefs else _PREFERENCE_NEGATIVE_TTL
+                )
+            return copy.deepcopy(value)
             
         except Exception as e:
             logger.error("Failed to get preferences", error=str(e))
@@ -97,34 +285,7 @@ class PersistentMemory:
             key: Preference key
             value: Preference value
         """
-        try:
-            # Use upsert (insert or update on conflict)
-            stmt = insert(UserPreference).values(
-                plan_id=plan_id,
-                preference_key=key,
-                preference_value=value
-            )
-            
-            stmt = stmt.on_conflict_do_update(
-                index_elements=['plan_id', 'preference_key'],
-                set_={
-                    'preference_value': value,
-                    'updated_at': stmt.excluded.updated_at
-                }
-            )
-            
-            await self.db.execute(stmt)
-            await self.db.flush()
-            
-            logger.debug(
-                "Set preference",
-                plan_id=str(plan_id),
-                key=key
-            )
-            
-        except Exception as e:
-            logger.error("Failed to set preference", error=str(e))
-            raise
+        await self.upsert(plan_id, {key: value})
     
     async def upsert(
         self,
@@ -134,12 +295,40 @@ class PersistentMemory:
         """
         Update multiple preferences at once.
         
+        Writes all keys in a single executemany of the shared
+        INSERT ... ON CONFLICT statement instead of one call per key.
+        
         Args:
             plan_id: Plan UUID
             preferences: Dict of key-value pairs to update
         """
-        for key, value in preferences.items():
-            await self.set(plan_id, key, value)
+        if not preferences:
+            return
+        
+        try:
+            # Use upsert (insert or update on conflict)
+            await self.db.execute(
+                _UPSERT_PREFERENCE,
+                [
+                    {
+                        "plan_id": plan_id,
+                        "preference_key": key,
+                        "preference_value": value,
+                    }
+                    for key, value in preferences.items()
+                ]
+            )
+            _invalidate_after_transaction(self.db, plan_id, list(preferences))
+            
+            logger.debug(
+                "Set preferences",
+                plan_id=str(plan_id),
+                keys=list(preferences)
+            )
+            
+        except Exception as e:
+            logger.error("Failed to set preferences", error=str(e))
+            raise
     
     async def delete(
         self,
@@ -165,6 +354,7 @@ class PersistentMemory:
                 stmt = stmt.where(UserPreference.preference_key == key)
             
             result = await self.db.execute(stmt)
+            _invalidate_after_transaction(self.db, plan_id, [key] if key else None)
             
             logger.info(
                 "Deleted preferences",
@@ -196,22 +386,45 @@ class PersistentMemory:
             insight: Insight text
             category: Insight category
         """
-        # Get existing insights
-        insights = await self.get(plan_id, PreferenceKey.ACCUMULATED_INSIGHTS)
-        
-        if not isinstance(insights, list):
-            insights = []
+        await self.add_insights(plan_id, [(insight, category)])
+    
+    async def add_insights(
+        self,
+        plan_id: uuid.UUID,
+        items: List[Tuple[str, str]]
+    ) -> None:
+        """
+        Add several accumulated insights in one statement.
         
-        # Add new insight
-        insights.append({
-            "text": insight,
-            "category": category,
-        })
+        Appends server-side and keeps only the last _MAX_INSIGHTS,
+        instead of reading and rewriting the whole list per insight.
         
-        # Keep only last 50 insights
-        insights = insights[-50:]
+        Args:
+            plan_id: Plan UUID
+            items: (insight text, category) pairs, oldest first
+        """
+        if not items:
+            return
         
-        await self.set(plan_id, PreferenceKey.ACCUMULATED_INSIGHTS, insights)
+        now = datetime.utcnow()
+        await self.db.execute(
+            _ADD_INSIGHTS_SQL,
+            {
+                "id": uuid.uuid4(),
+                "plan_id": plan_id,
+                "key": PreferenceKey.ACCUMULATED_INSIGHTS,
+                "insights": json.dumps(
+                    [
+                        {"text": insight, "category": category}
+                        for insight, category in items[-_MAX_INSIGHTS:]
+                    ],
+                    ensure_ascii=False
+                ),
+                "max_insights": _MAX_INSIGHTS,
+                "now": now,
+            }
+        )
+        _invalidate_after_transaction(self.db, plan_id, [PreferenceKey.ACCUMULATED_INSIGHTS])
     
     async def get_insights(
         self,
@@ -275,26 +488,29 @@ class PersistentMemory:
         """
         key = PreferenceKey.PREFERRED_EXERCISES if preferred else PreferenceKey.AVOIDED_EXERCISES
         
-        exercises = await self.get(plan_id, key)
-        
-        if not isinstance(exercises, list):
-            exercises = []
-        
-        # Check if already exists
-        existing = next((e for e in exercises if e.get("name") == exercise), None)
-        
-        if existing:
-            if reason:
-                existing["reason"] = reason
-        else:
-            exercises.append({
+        # Merge server-side in one statement: append a new exercise, or
+        # update the reason of an existing one (only if a reason is given)
+        now = datetime.utcnow()
+        await self.db.execute(
+            _ADD_EXERCISE_PREFERENCE_SQL,
+            {
+                "id": uuid.uuid4(),
+                "plan_id": plan_id,
+                "key": key,
+                "entry": json.dumps(
+                    [{"name": exercise, "reason": reason}],
+                    ensure_ascii=False
+                ),
+                "match": json.dumps([{"name": exercise}], ensure_ascii=False),
                 "name": exercise,
-                "reason": reason
-            })
-        
-        await self.set(plan_id, key, exercises)
+                "reason": reason or None,
+                "now": now,
+            }
+        )
+        _invalidate_after_transaction(self.db, plan_id, [key])
     
-    def format_for_context(self, preferences: Dict[str, Any]) -> str:
+    @staticmethod
+    def format_for_context(preferences: Dict[str, Any]) -> str:
         """
         Format preferences as context string for prompts.
         
@@ -8,8 +8,12 @@ Stores:
 
 This is in-memory storage that expires with the session.
 """
-from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta
+import asyncio
+import time
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, List, Optional
+from datetime import datetime
 from dataclasses import dataclass, field
 from threading import Lock
 
@@ -17,24 +21,33 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Messages kept per session; older ones are dropped as new ones arrive
+_MAX_HISTORY = 200
 
-@dataclass
+
+def _new_history() -> "deque[dict[str, str]]":
+    """Create a bounded conversation history."""
+    return deque(maxlen=_MAX_HISTORY)
+
+
+@dataclass(slots=True)
 class SessionState:
     """State for a single session."""
     session_id: str
     plan_id: Optional[str] = None
-    conversation_history: List[dict[str, str]] = field(default_factory=list)
+    conversation_history: "deque[dict[str, str]]" = field(default_factory=_new_history)
     context: dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.utcnow)
-    last_accessed: datetime = field(default_factory=datetime.utcnow)
+    # Monotonic clock (ns) of last access, used only for expiry
+    last_accessed_ns: int = field(default_factory=time.monotonic_ns)
     
     def is_expired(self, ttl_minutes: int = 60) -> bool:
         """Check if session has expired."""
-        return datetime.utcnow() - self.last_accessed > timedelta(minutes=ttl_minutes)
+        return time.monotonic_ns() - self.last_accessed_ns > ttl_minutes * 60_000_000_000
     
     def touch(self) -> None:
         """Update last accessed time."""
-        self.last_accessed = datetime.utcnow()
+        self.last_accessed_ns = time.monotonic_ns()
 
 
 class WorkingMemory:
@@ -43,6 +56,10 @@ class WorkingMemory:
     
     Thread-safe storage for session-scoped data.
     Automatically cleans up expired sessions.
+    
+    Methods are synchronous and never hold the lock across an await,
+    so coroutines can call them directly; the lock only matters when
+    threads (e.g. sync endpoints in the threadpool) share the instance.
     """
     
     def __init__(self, ttl_minutes: int = 60):
@@ -52,10 +69,18 @@ class WorkingMemory:
         Args:
             ttl_minutes: Time-to-live for sessions in minutes
         """
-        self._sessions: Dict[str, SessionState] = {}
+        # Ordered by last access (oldest first), so expired sessions
+        # are always at the front
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
         self._lock = Lock()
         self._ttl_minutes = ttl_minutes
     
+    def _touch(self, session: SessionState) -> None:
+        """Update a session's access time and move it to the back. Caller holds the lock."""
+        session.touch()
+        if session.session_id in self._sessions:
+            self._sessions.move_to_end(session.session_id)
+    
     def get(self, session_id: str) -> Optional[SessionState]:
         """
         Get session state.
@@ -76,7 +101,7 @@ class WorkingMemory:
                 del self._sessions[session_id]
                 return None
             
-            session.touch()
+            self._touch(session)
             return session
     
     def get_or_create(
@@ -95,22 +120,31 @@ class WorkingMemory:
             SessionState
         """
         with self._lock:
-            session = self._sessions.get(session_id)
-            
-            if session is not None and not session.is_expired(self._ttl_minutes):
-                session.touch()
-                return session
-            
-            # Create new session
-            session = SessionState(
-                session_id=session_id,
-                plan_id=plan_id
-            )
-            self._sessions[session_id] = session
-            
-            logger.debug("Created new working memory session", session_id=session_id)
-            
+            return self._get_or_create_locked(session_id, plan_id)
+    
+    def _get_or_create_locked(
+        self,
+        session_id: str,
+        plan_id: Optional[str] = None
+    ) -> SessionState:
+        """get_or_create() body. Caller holds the lock."""
+        session = self._sessions.get(session_id)
+        
+        if session is not None and not session.is_expired(self._ttl_minutes):
+            self._touch(session)
             return session
+        
+        # Create new session
+        session = SessionState(
+            session_id=session_id,
+            plan_id=plan_id
+        )
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        
+        logger.debug("Created new working memory session", session_id=session_id)
+        
+        return session
     
     def update(
         self,
@@ -136,12 +170,14 @@ class WorkingMemory:
                 session.plan_id = updates["plan_id"]
             
             if "conversation_history" in updates:
-                session.conversation_history = updates["conversation_history"]
+                session.conversation_history = deque(
+                    updates["conversation_history"], maxlen=_MAX_HISTORY
+                )
             
             if "context" in updates:
                 session.context.update(updates["context"])
             
-            session.touch()
+            self._touch(session)
     
     def add_message(
         self,
@@ -157,14 +193,12 @@ class WorkingMemory:
             role: Message role (user/assistant)
             content: Message content
         """
-        session = self.get_or_create(session_id)
-        
         with self._lock:
+            session = self._get_or_create_locked(session_id)
             session.conversation_history.append({
                 "role": role,
                 "content": content
             })
-            session.touch()
     
     def get_conversation_history(
         self,
@@ -188,10 +222,10 @@ class WorkingMemory:
         
         history = session.conversation_history
         
-        if limit is not None:
-            return history[-limit:]
+        if limit:
+            return list(islice(history, max(0, len(history) - limit), None))
         
-        return history
+        return list(history)
     
     def set_context(
         self,
@@ -207,11 +241,9 @@ class WorkingMemory:
             key: Context key
             value: Context value
         """
-        session = self.get_or_create(session_id)
-        
         with self._lock:
+            session = self._get_or_create_locked(session_id)
             session.context[key] = value
-            session.touch()
     
     def get_context(
         self,
@@ -253,22 +285,42 @@ class WorkingMemory:
         """
         Remove all expired sessions.
         
+        Sessions are kept in access order, so this stops at the first
+        live one instead of scanning every session.
+        
         Returns:
             Number of sessions removed
         """
         with self._lock:
-            expired = [
-                sid for sid, session in self._sessions.items()
-                if session.is_expired(self._ttl_minutes)
-            ]
+            removed = 0
+            while self._sessions:
+                session = next(iter(self._sessions.values()))
+                if not session.is_expired(self._ttl_minutes):
+                    break
+                self._sessions.popitem(last=False)
+                removed += 1
             
-            for sid in expired:
-                del self._sessions[sid]
+            if removed:
+                logger.info("Cleaned up expired sessions", count=removed)
             
-            if expired:
-                logger.info("Cleaned up expired sessions", count=len(expired))
-            
-            return len(expired)
+            return removed
+    
+    async def run_cleanup(self, interval_seconds: float = 60.0) -> None:
+        """
+        Remove expired sessions periodically until cancelled.
+        
+        Expired sessions are otherwise only dropped when their ID is
+        looked up again, so abandoned sessions would stay in memory.
+        
+        Args:
+            interval_seconds: Seconds between cleanup passes
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                logger.warning("Working memory cleanup failed", error=str(e))
     
     def to_dict(self, session_id: str) -> dict[str, Any]:
         """
@@ -288,7 +340,7 @@ class WorkingMemory:
         return {
             "session_id": session.session_id,
             "plan_id": session.plan_id,
-            "conversation_history": session.conversation_history,
+            "conversation_history": list(session.conversation_history),
             "context": session.context,
         }
 
@@ -0,0 +1,27 @@
+-- One-off upgrade for databases created before the half-precision
+-- embedding index. New databases get the index from create_all() at
+-- startup and do not need this.
+--
+-- Safe to re-run: already unit-length rows are skipped and the index is
+-- only built if missing.
+--
+--   docker compose exec -T db psql -U mycoach -d mycoach \
+--       < backend/migrations/001_context_embeddings_halfvec.sql
+
+BEGIN;
+
+-- Search ranks by inner product, which equals cosine similarity only for
+-- unit-length vectors
+UPDATE context_embeddings
+SET embedding = l2_normalize(embedding)
+WHERE abs(vector_norm(embedding) - 1) > 1e-6;
+
+-- Replace the original ivfflat cosine index
+DROP INDEX IF EXISTS ix_context_embeddings_embedding;
+
+CREATE INDEX IF NOT EXISTS ix_context_embeddings_embedding_half
+ON context_embeddings USING hnsw
+((CAST(embedding AS HALFVEC(1536))) halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
+
+COMMIT;
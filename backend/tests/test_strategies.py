@@ -0,0 +1,80 @@
+"""
+Tests for the last-interval drop metrics in the analytics strategies.
+"""
+from typing import List, Tuple
+
+from app.services.analytics.adapter import IntervalData, NormalizedActivity
+from app.services.analytics.strategies import CyclingStrategy, RunningStrategy
+
+
+def _activity(
+    activity_type: str,
+    rows: List[Tuple[str, int, float]],
+    column: str
+) -> NormalizedActivity:
+    """Build an activity from (interval_type, duration_seconds, value) rows."""
+    return NormalizedActivity(
+        activity_type=activity_type,
+        duration_seconds=sum(duration for _, duration, _ in rows),
+        intervals=[
+            IntervalData(
+                index=i,
+                interval_type=interval_type,
+                duration_seconds=duration,
+                **{column: value}
+            )
+            for i, (interval_type, duration, value) in enumerate(rows)
+        ],
+    )
+
+
+def test_power_drop_weights_previous_intervals_by_duration():
+    # Weighted baseline (300*600 + 200*60) / 660 = 290.9 W; the unweighted
+    # mean of 250 W would give 4.0%. The recovery interval is ignored.
+    activity = _activity("cycling", [
+        ("work", 600, 300),
+        ("recovery", 120, 120),
+        ("work", 60, 200),
+        ("work", 300, 240),
+    ], "avg_power")
+    
+    level2 = CyclingStrategy().compute_level2(activity)
+    
+    assert level2["power_drop_last_interval_pct"] == 17.5
+
+
+def test_power_drop_falls_back_to_plain_mean_without_durations():
+    activity = _activity("cycling", [
+        ("work", 0, 300),
+        ("work", 0, 200),
+        ("work", 0, 240),
+    ], "avg_power")
+    
+    level2 = CyclingStrategy().compute_level2(activity)
+    
+    assert level2["power_drop_last_interval_pct"] == 4.0
+
+
+def test_power_drop_needs_two_work_intervals():
+    activity = _activity("cycling", [
+        ("warmup", 600, 150),
+        ("work", 600, 300),
+    ], "avg_power")
+    
+    level2 = CyclingStrategy().compute_level2(activity)
+    
+    assert "power_drop_last_interval_pct" not in level2
+
+
+def test_pace_drop_weights_previous_intervals_by_duration():
+    # Weighted baseline (5.0*600 + 6.0*60) / 660 = 5.09 min/km; the
+    # unweighted mean of 5.5 min/km would give 0.0%.
+    activity = _activity("running", [
+        ("work", 600, 5.0),
+        ("work", 60, 6.0),
+        ("work", 300, 5.5),
+    ], "avg_pace")
+    
+    level2 = RunningStrategy().compute_level2(activity)
+    
+    assert level2["pace_drop_last_interval_pct"] == 8.0